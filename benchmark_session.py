@@ -0,0 +1,90 @@
+# stdlib
+import argparse
+import os
+import pickle
+import tempfile
+import timeit
+# lib
+# local
+import sql_utils
+
+#################################################################################
+#  Benchmark the read cost of one session field   (Run by hand, uses a          #
+#            throwaway database so installer.db is never touched)               #
+#################################################################################
+#  i)    pickle    The old layout, read the pickled blob and unpickle all of it #
+#  ii)   full      get_instanciated_metadata() on a cold cache                  #
+#  iii)  field     get_session_value() on a cold cache, json_extract() only     #
+#  iv)   warm      get_session_value() once the session constant is cached      #
+#################################################################################
+
+
+def sample_metadata(interfaces):
+    """
+    :param interfaces: The number of interface entries to pad config.json with
+    :return: An instanciated_metadata dictionary with a config.json of the usual shape
+    """
+    config = {
+        'blend': 1,
+        'pod_number': 7,
+        'pod_name': 'pod-7',
+        'ipv6_subnet': '2a02:2078:9::/48',
+        'primary_ipv4_subnet': '91.103.0.0/24',
+        'ipv4_link_subnet': '185.0.0.0/30',
+        'ipv6_link_subnet': '2a02::/126',
+    }
+    for index in range(interfaces):
+        config[f'interface_{index}_ifname'] = f'enp{index}s0f0'
+        config[f'interface_{index}_mac'] = f'3c:ec:ef:00:{index // 256:02x}:{index % 256:02x}'
+    return {'config.json': config}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the read cost of one session field per storage layout.')
+    parser.add_argument('--number', type=int, default=2000, help='Reads timed per layout')
+    parser.add_argument('--interfaces', type=int, default=200, help='Interface entries to pad config.json with')
+    args = parser.parse_args(argv)
+
+    metadata = sample_metadata(args.interfaces)
+    with tempfile.TemporaryDirectory() as directory:
+        sql_utils.DB_PATH = os.path.join(directory, 'installer.db')
+        with sql_utils.get_connection() as conn:
+            cur = conn.cursor()
+            sql_utils._create_tables(cur)
+            cur.execute(
+                'INSERT INTO session_constants VALUES (1, ?, ?, ?);',
+                ('{}', sql_utils._to_json(metadata), '{}'),
+            )
+            cur.execute('CREATE TABLE pickled (id INTEGER PRIMARY KEY, instanciated_metadata BLOB);')
+            cur.execute('INSERT INTO pickled VALUES (1, ?);', (pickle.dumps(metadata),))
+        size = len(sql_utils._to_json(metadata))
+
+        def read_pickle():
+            cur = sql_utils.get_connection().execute('SELECT instanciated_metadata FROM pickled WHERE id = 1;')
+            return pickle.loads(cur.fetchone()[0])['config.json']['ipv6_subnet']
+
+        def read_full():
+            sql_utils.invalidate_session_constants()
+            return sql_utils.get_instanciated_metadata()['config.json']['ipv6_subnet']
+
+        def read_field():
+            sql_utils.invalidate_session_constants()
+            return sql_utils.get_session_value('instanciated_metadata', 'config.json', 'ipv6_subnet')
+
+        def read_warm():
+            return sql_utils.get_session_value('instanciated_metadata', 'config.json', 'ipv6_subnet')
+
+        print(f'config.json of {size} bytes, {args.number} reads of config.json.ipv6_subnet per layout')
+        for name, read in (('pickle', read_pickle), ('full', read_full), ('field', read_field), ('warm', read_warm)):
+            if name == 'warm':
+                # Fill the cache the way data_blob() does before the tests run
+                sql_utils.get_instanciated_metadata()
+            seconds = min(timeit.repeat(read, number=args.number, repeat=3))
+            print(f'{name:<8}{seconds / args.number * 1e6:10.1f} us per read')
+        sql_utils.get_connection().close()
+        sql_utils._connections.conn = None
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -88,16 +88,17 @@
 # stdlib
 # lib
 # local
+from host_status import *
+from results import ResultAccumulator
+from scheduler import REGISTRY, plan_tests, run_tests
 from sql_utils import (
     get_cidata,
     get_host_details,
     get_instanciated_infra,
     get_instanciated_metadata,
-    get_test_bit_map,
-    get_test_results,
+    get_test_bit_maps,
     insert_host_status,
     set_up_sqlite,
-    update_fail_map,
     update_test_levels,
 )
 from tests import *
@@ -108,48 +109,15 @@ __all__ = [
 ]
 
 
-##  Host Status Bitwise Encoding  ##
-# blend (bits 1 to 4)
-cop, region, copregion, pat = 2, 4, 6, 7
+# The number of tests run by data_blob(), one result slot per registered test_id
+number_of_tests = max(REGISTRY) + 1
 
-# status (bits 7 to 9)
-validate, install, reinstall = 64, 128, 256
 
-# hostname (bits 12 up with 14 blank to allow for podnet_c in the future)
-podnet_a, podnet_b, appliance_a = 4096, 8192, 32768
-
-# host_status
-cop_validate_podnet_a          = cop        + validate    + podnet_a     # 4162
-cop_validate_podnet_b          = cop        + validate    + podnet_b     # 8258
-cop_validate_appliance_a       = cop        + validate    + appliance_a  # 32834
-cop_install_podnet_a           = cop        + install     + podnet_a     # 4226
-cop_install_podnet_b           = cop        + install     + podnet_b     # 8322
-cop_install_appliance_a        = cop        + install     + appliance_a  # 32898
-cop_reinstall_podnet_a         = cop        + reinstall   + podnet_a     # 4354
-region_validate_podnet_a       = region     + validate    + podnet_a     # 4164
-region_validate_podnet_b       = region     + validate    + podnet_b     # 8260
-region_validate_appliance_a    = region     + validate    + appliance_a  # 32836
-region_install_podnet_a        = region     + install     + podnet_a     # 4228
-region_install_podnet_b        = region     + install     + podnet_b     # 8324
-region_install_appliance_a     = region     + install     + appliance_a  # 32900
-region_reinstall_podnet_a      = region     + reinstall   + podnet_a     # 4356
-copregion_validate_podnet_a    = copregion  + validate    + podnet_a     # 4166
-copregion_validate_podnet_b    = copregion  + validate    + podnet_b     # 8262
-copregion_validate_appliance_a = copregion  + validate    + appliance_a  # 32838
-copregion_install_podnet_a     = copregion  + install     + podnet_a     # 4230
-copregion_install_podnet_b     = copregion  + install     + podnet_b     # 8326
-copregion_install_appliance_a  = copregion  + install     + appliance_a  # 32902
-copregion_reinstall_podnet_a   = copregion  + reinstall   + podnet_a     # 4358
-pat_validate_podnet_a          = pat        + validate    + podnet_a     # 4167
-pat_validate_podnet_b          = pat        + validate    + podnet_b     # 8263
-pat_validate_appliance_a       = pat        + validate    + appliance_a  # 32839
-pat_install_podnet_a           = pat        + install     + podnet_a     # 4231
-pat_install_podnet_b           = pat        + install     + podnet_b     # 8327
-pat_install_appliance_a        = pat        + install     + appliance_a  # 32903
-pat_reinstall_podnet_a         = pat        + reinstall   + podnet_a     # 4359
-
-
-def data_blob():
+def data_blob(write_through=False):
+    """
+    :param write_through: Write each test result to installer.db as it is recorded instead of once at the end
+    :return: host_status, host_status_text, pass_map, warn_map, fail_map, test_result
+    """
 
     set_up_sqlite()
 
@@ -165,293 +133,44 @@ def data_blob():
     instanciated_infra = get_instanciated_infra()
     instanciated_metadata = get_instanciated_metadata()
     instanciated_blend = instanciated_metadata['config.json'].get('blend', 0)
-    invert = get_test_bit_map('invert')
-
-    if instanciated_blend == cop:
-        if instanciated_infra['hostname'] == 'podnet-a':
-            if cidata['mountable'] is True:
-                if podnet_b_enabled is False:
-                    host_status = cop_install_podnet_a
-                    host_status_text = "cop_install_podnet_a"
-                else:
-                    host_status = cop_reinstall_podnet_a
-                    host_status_text = "cop_reinstall_podnet_a"
-            else:
-                host_status = cop_validate_podnet_a
-                host_status_text = "cop_validate_podnet_a"
-
-        elif instanciated_infra['hostname'] == 'podnet-b':
-            if cidata['mountable'] is True:
-                host_status = cop_install_podnet_b
-                host_status_text = "cop_install_podnet_b"
-            else:
-                host_status = cop_validate_podnet_b
-                host_status_text = "cop_validate_podnet_b"
-
-        elif instanciated_infra['hostname'] == 'appliance-a':
-            if cidata['mountable'] is True:
-                host_status = cop_install_appliance_a
-                host_status_text = "cop_install_appliance_a"
-            else:
-                host_status = cop_validate_appliance_a
-                host_status_text = "cop_validate_appliance_a"
-        else:
-                host_status = 0
-
-    elif instanciated_blend == region:
-        if instanciated_infra['hostname'] == 'podnet-a':
-            if cidata['mountable'] is True:
-                if podnet_b_enabled is False:
-                    host_status = region_install_podnet_a
-                    host_status_text = "region_install_podnet_a"
-                else:
-                    host_status = region_reinstall_podnet_a
-                    host_status_text = "region_reinstall_podnet_a"
-            else:
-                host_status = region_validate_podnet_a
-                host_status_text = "region_validate_podnet_a"
-
-        elif instanciated_infra['hostname'] == 'podnet-b':
-            if cidata['mountable'] is True:
-                host_status = region_install_podnet_b
-                host_status_text = "region_install_podnet_b"
-            else:
-                host_status = region_validate_podnet_b
-                host_status_text = "region_validate_podnet_b"
-
-        elif instanciated_infra['hostname'] == 'appliance-a':
-            if cidata['mountable'] is True:
-                host_status = region_install_appliance_a
-                host_status_text = "region_install_appliance_a"
-            else:
-                host_status = region_validate_appliance_a
-                host_status_text = "region_validate_appliance_a"
-        else:
-                host_status = 0
-
-    elif instanciated_blend == copregion:
-        if instanciated_infra['hostname'] == 'podnet-a':
-            if cidata['mountable'] is True:
-                if podnet_b_enabled is False:
-                    host_status = copregion_install_podnet_a
-                    host_status_text = "copregion_install_podnet_a"
-                else:
-                    host_status = copregion_reinstall_podnet_a
-                    host_status_text = "copregion_reinstall_podnet_a"
-            else:
-                host_status = copregion_validate_podnet_a
-                host_status_text = "copregion_validate_podnet_a"
-
-        elif instanciated_infra['hostname'] == 'podnet-b':
-            if cidata['mountable'] is True:
-                host_status = copregion_install_podnet_b
-                host_status_text = "copregion_install_podnet_b"
-            else:
-                host_status = copregion_validate_podnet_b
-                host_status_text = "copregion_validate_podnet_b"
-
-        elif instanciated_infra['hostname'] == 'appliance-a':
-            if cidata['mountable'] is True:
-                host_status = copregion_install_appliance_a
-                host_status_text = "copregion_install_appliance_a"
-            else:
-                host_status = copregion_validate_appliance_a
-                host_status_text = "copregion_validate_appliance_a"
-        else:
-                host_status = 0
-    elif instanciated_blend == pat:
-        if instanciated_infra['hostname'] == 'podnet-a':
-            if cidata['mountable'] is True:
-                if podnet_b_enabled is False:
-                    host_status = pat_install_podnet_a
-                    host_status_text = "pat_install_podnet_a"
-                else:
-                    host_status = pat_reinstall_podnet_a
-                    host_status_text = "pat_reinstall_podnet_a"
-            else:
-                host_status = pat_validate_podnet_a
-                host_status_text = "pat_validate_podnet_a"
-
-        elif instanciated_infra['hostname'] == 'podnet-b':
-            if cidata['mountable'] is True:
-                host_status = pat_install_podnet_b
-                host_status_text = "pat_install_podnet_b"
-            else:
-                host_status = pat_validate_podnet_b
-                host_status_text = "pat_validate_podnet_b"
-
-        elif instanciated_infra['hostname'] == 'appliance-a':
-            if cidata['mountable'] is True:
-                host_status = pat_install_appliance_a
-                host_status_text = "pat_install_appliance_a"
-            else:
-                host_status = pat_validate_appliance_a
-                host_status_text = "pat_validate_appliance_a"
-        else:
-                host_status = 0
-    else:
-        host_status = 0
+    # All test maps are loaded in one query and shared for the session
+    test_maps = get_test_bit_maps()
+    invert = test_maps['invert']
 
+    host_status = resolve_host_status(
+        instanciated_blend, instanciated_infra['hostname'], cidata['mountable'], podnet_b_enabled,
+    )
     if host_status == 0:
         host_status_text = 'Unknown'
-        fail_map = invert  # All ones representing all tests have failed
-        update_fail_map(fail_map)
-    
-    insert_host_status(host_status, host_status_text)
-
-    # Determine which maps to use based on host_status
-    if host_status == cop_validate_podnet_a:
-        warn = get_test_bit_map('cop_validate_podnet_a_warn')
-        fail = get_test_bit_map('cop_validate_podnet_a_fail')
-    elif host_status == cop_validate_podnet_b:
-        warn = get_test_bit_map('cop_validate_podnet_b_warn')
-        fail = get_test_bit_map('cop_validate_podnet_b_fail')
-    elif host_status == cop_validate_appliance_a:
-        warn = get_test_bit_map('cop_validate_appliance_a_warn')
-        fail = get_test_bit_map('cop_validate_appliance_a_fail')
-    elif host_status == cop_install_podnet_a:
-        warn = get_test_bit_map('cop_install_podnet_a_warn')
-        fail = get_test_bit_map('cop_install_podnet_a_fail')
-    elif host_status == cop_install_podnet_b:
-        warn = get_test_bit_map('cop_install_podnet_b_warn')
-        fail = get_test_bit_map('cop_install_podnet_b_fail')
-    elif host_status == cop_install_appliance_a:
-        warn = get_test_bit_map('cop_install_appliance_a_warn')
-        fail = get_test_bit_map('cop_install_appliance_a_fail')
-    elif host_status == cop_reinstall_podnet_a:
-        warn = get_test_bit_map('cop_reinstall_podnet_a_warn')
-        fail = get_test_bit_map('cop_reinstall_podnet_a_fail')
-    elif host_status == region_validate_podnet_a:
-        warn = get_test_bit_map('region_validate_podnet_a_warn')
-        fail = get_test_bit_map('region_validate_podnet_a_fail')
-    elif host_status == region_validate_podnet_b:
-        warn = get_test_bit_map('region_validate_podnet_b_warn')
-        fail = get_test_bit_map('region_validate_podnet_b_fail')
-    elif host_status == region_validate_appliance_a:
-        warn = get_test_bit_map('region_validate_appliance_a_warn')
-        fail = get_test_bit_map('region_validate_appliance_a_fail')
-    elif host_status == region_install_podnet_a:
-        warn = get_test_bit_map('region_install_podnet_a_warn')
-        fail = get_test_bit_map('region_install_podnet_a_fail')
-    elif host_status == region_install_podnet_b:
-        warn = get_test_bit_map('region_install_podnet_b_warn')
-        fail = get_test_bit_map('region_install_podnet_b_fail')
-    elif host_status == region_install_appliance_a:
-        warn = get_test_bit_map('region_install_appliance_a_warn')
-        fail = get_test_bit_map('region_install_appliance_a_fail')
-    elif host_status == region_reinstall_podnet_a:
-        warn = get_test_bit_map('region_reinstall_podnet_a_warn')
-        fail = get_test_bit_map('region_reinstall_podnet_a_fail')
-    elif host_status == copregion_validate_podnet_a:
-        warn = get_test_bit_map('copregion_validate_podnet_a_warn')
-        fail = get_test_bit_map('copregion_validate_podnet_a_fail')
-    elif host_status == copregion_validate_podnet_b:
-        warn = get_test_bit_map('copregion_validate_podnet_b_warn')
-        fail = get_test_bit_map('copregion_validate_podnet_b_fail')
-    elif host_status == copregion_validate_appliance_a:
-        warn = get_test_bit_map('copregion_validate_appliance_a_warn')
-        fail = get_test_bit_map('copregion_validate_appliance_a_fail')
-    elif host_status == copregion_install_podnet_a:
-        warn = get_test_bit_map('copregion_install_podnet_a_warn')
-        fail = get_test_bit_map('copregion_install_podnet_a_fail')
-    elif host_status == copregion_install_podnet_b:
-        warn = get_test_bit_map('copregion_install_podnet_b_warn')
-        fail = get_test_bit_map('copregion_install_podnet_b_fail')
-    elif host_status == copregion_install_appliance_a:
-        warn = get_test_bit_map('copregion_install_appliance_a_warn')
-        fail = get_test_bit_map('copregion_install_appliance_a_fail')
-    elif host_status == copregion_reinstall_podnet_a:
-        warn = get_test_bit_map('copregion_reinstall_podnet_a_warn')
-        fail = get_test_bit_map('copregion_reinstall_podnet_a_fail')
-    elif host_status == pat_validate_podnet_a:
-        warn = get_test_bit_map('pat_validate_podnet_a_warn')
-        fail = get_test_bit_map('pat_validate_podnet_a_fail')
-    elif host_status == pat_validate_podnet_b:
-        warn = get_test_bit_map('pat_validate_podnet_b_warn')
-        fail = get_test_bit_map('pat_validate_podnet_b_fail')
-    elif host_status == pat_validate_appliance_a:
-        warn = get_test_bit_map('pat_validate_appliance_a_warn')
-        fail = get_test_bit_map('pat_validate_appliance_a_fail')
-    elif host_status == pat_install_podnet_a:
-        warn = get_test_bit_map('pat_install_podnet_a_warn')
-        fail = get_test_bit_map('pat_install_podnet_a_fail')
-    elif host_status == pat_install_podnet_b:
-        warn = get_test_bit_map('pat_install_podnet_b_warn')
-        fail = get_test_bit_map('pat_install_podnet_b_fail')
-    elif host_status == pat_install_appliance_a:
-        warn = get_test_bit_map('pat_install_appliance_a_warn')
-        fail = get_test_bit_map('pat_install_appliance_a_fail')
-    elif host_status == pat_reinstall_podnet_a:
-        warn = get_test_bit_map('pat_reinstall_podnet_a_warn')
-        fail = get_test_bit_map('pat_reinstall_podnet_a_fail')
-    else:
         warn = 0b0
         fail = 0b0
-    
+    else:
+        # Determine which maps to use based on host_status
+        entry = HOST_STATUSES[host_status]
+        host_status_text = entry['name']
+        warn = test_maps[entry['warn']]
+        fail = test_maps[entry['fail']]
+
+    insert_host_status(host_status, host_status_text)
+
     ignore = (warn | fail) ^ invert
 
     update_test_levels(fail, ignore, warn)
 
+    # Test results are accumulated in memory and written to installer.db once all tests have run
+    details = ResultAccumulator(number_of_tests, fail, ignore, warn, write_through)
+    if host_status == 0:
+        details.fail_map = invert  # All ones representing all tests have failed
+
     ##########################################################################
-    #      Run the Tests   (test_id, optional test value)                    #
+    #      Run the Tests registered in tests.py                              #
+    #      Ignored tests are recorded up front and never run                 #
     ##########################################################################
 
-    hard_core_coun(0, 20)
-    hard_ram_count(1, 8)
-    hard_stor_coun(2, 300)
-    hard_pprt_coun(3, 5)
-    hard_aprt_coun(4, 1)
-    hard_publ_oper(5)
-    hard_publ_carr(6)
-    hard_publ_ethn(7)
-    hard_mgmt_oper(8)
-    hard_mgmt_carr(9)
-    hard_mgmt_ethn(10)
-    hard_oob__oper(11)
-    hard_oob__carr(12)
-    hard_oob__ethn(13)
-    hard_priv_oper(14)
-    hard_priv_carr(15)
-    hard_priv_ethn(16)
-    hard_intr_oper(17)
-    hard_intr_carr(18)
-    hard_intr_ethn(19)
-    config_matches(20)
-    inst_conf_pnum(21)
-    inst_conf_pnam(22)
-    inst_conf_blen(23, [cop, region, copregion, pat])
-    inst_conf_aena(24)
-    inst_conf_aenb(25)
-    inst_conf_bena(26)
-    inst_conf_benb(27)
-    inst_conf_aben(28)
-    inst_conf_4lvr(29)
-    inst_conf_4lvm(30)
-    inst_conf_4cva(31)
-    inst_conf_4cpe(32)
-    inst_conf_4pva(33)
-    inst_conf__4pe(34)
-    inst_conf_4pvc(35)
-    inst_conf_6lvr(36)
-    inst_conf_6lvm(37)
-    inst_conf_6cva(38)
-    inst_conf_6cpe(39)
-    inst_conf_6pva(40)
-    inst_conf__6pe(41)
-    inst_conf_6pvc(42)
-    inst_conf_4pmv(43)
-    inst_conf_4pmm(44)
-    inst_conf_6pmv(45)
-    inst_conf_6pmm(46)
-    ping_ipv4___pe(47)
-    ping_ipv4__cpe(48)
-    ping_ipv4_8888(49)
-    ping_ipv6___pe(50)
-    ping_ipv6__cpe(51)
-    ping_ipv6_8888(52)
-    ping_dns__ggle(53)
+    active_tests = plan_tests(details)
+    run_tests(details, active_tests)
 
-    pass_map, warn_map, fail_map, test_result = get_test_results()
+    details.flush()
     host_status, host_status_text = get_host_details()
 
-    return host_status, host_status_text, pass_map, warn_map, fail_map, test_result
+    return host_status, host_status_text, details.pass_map, details.warn_map, details.fail_map, details.result
@@ -0,0 +1,91 @@
+##  Host Status Bitwise Encoding  ##
+# host_status = blend + status + hostname, shared by data_blob, the tests and the installer
+
+# blend (bits 1 to 4)
+cop, region, copregion, pat = 2, 4, 6, 7
+
+# status (bits 7 to 9)
+validate, install, reinstall = 64, 128, 256
+
+# hostname (bits 12 up with 14 blank to allow for podnet_c in the future)
+podnet_a, podnet_b, appliance_a = 4096, 8192, 32768
+
+# host_status
+cop_validate_podnet_a          = cop        + validate    + podnet_a     # 4162
+cop_validate_podnet_b          = cop        + validate    + podnet_b     # 8258
+cop_validate_appliance_a       = cop        + validate    + appliance_a  # 32834
+cop_install_podnet_a           = cop        + install     + podnet_a     # 4226
+cop_install_podnet_b           = cop        + install     + podnet_b     # 8322
+cop_install_appliance_a        = cop        + install     + appliance_a  # 32898
+cop_reinstall_podnet_a         = cop        + reinstall   + podnet_a     # 4354
+region_validate_podnet_a       = region     + validate    + podnet_a     # 4164
+region_validate_podnet_b       = region     + validate    + podnet_b     # 8260
+region_validate_appliance_a    = region     + validate    + appliance_a  # 32836
+region_install_podnet_a        = region     + install     + podnet_a     # 4228
+region_install_podnet_b        = region     + install     + podnet_b     # 8324
+region_install_appliance_a     = region     + install     + appliance_a  # 32900
+region_reinstall_podnet_a      = region     + reinstall   + podnet_a     # 4356
+copregion_validate_podnet_a    = copregion  + validate    + podnet_a     # 4166
+copregion_validate_podnet_b    = copregion  + validate    + podnet_b     # 8262
+copregion_validate_appliance_a = copregion  + validate    + appliance_a  # 32838
+copregion_install_podnet_a     = copregion  + install     + podnet_a     # 4230
+copregion_install_podnet_b     = copregion  + install     + podnet_b     # 8326
+copregion_install_appliance_a  = copregion  + install     + appliance_a  # 32902
+copregion_reinstall_podnet_a   = copregion  + reinstall   + podnet_a     # 4358
+pat_validate_podnet_a          = pat        + validate    + podnet_a     # 4167
+pat_validate_podnet_b          = pat        + validate    + podnet_b     # 8263
+pat_validate_appliance_a       = pat        + validate    + appliance_a  # 32839
+pat_install_podnet_a           = pat        + install     + podnet_a     # 4231
+pat_install_podnet_b           = pat        + install     + podnet_b     # 8327
+pat_install_appliance_a        = pat        + install     + appliance_a  # 32903
+pat_reinstall_podnet_a         = pat        + reinstall   + podnet_a     # 4359
+
+##  Host Status Lookup  ##
+# The names of the parts of a host_status
+BLENDS = {cop: 'cop', region: 'region', copregion: 'copregion', pat: 'pat'}
+STATUSES = {validate: 'validate', install: 'install', reinstall: 'reinstall'}
+HOSTNAMES = {'podnet-a': podnet_a, 'podnet-b': podnet_b, 'appliance-a': appliance_a}
+
+# The status and hostname combinations that exist for every blend, only podnet_a can be reinstalled
+_COMBINATIONS = (
+    (validate, podnet_a), (validate, podnet_b), (validate, appliance_a),
+    (install, podnet_a), (install, podnet_b), (install, appliance_a),
+    (reinstall, podnet_a),
+)
+
+# host_status -> name, the test_map names of its warn and fail maps and the installer_plans plan that builds it.
+# Validate statuses have nothing to build so their installer is None.
+HOST_STATUSES = {}
+for _blend, _blend_name in BLENDS.items():
+    for _status, _hostname in _COMBINATIONS:
+        _hostname_name = next(name for name, bit in HOSTNAMES.items() if bit == _hostname).replace('-', '_')
+        _name = f'{_blend_name}_{STATUSES[_status]}_{_hostname_name}'
+        HOST_STATUSES[_blend + _status + _hostname] = {
+            'name': _name,
+            'warn': f'{_name}_warn',
+            'fail': f'{_name}_fail',
+            'installer': _name if _status != validate else None,
+        }
+
+
+def resolve_host_status(blend, hostname, mountable, podnet_b_enabled):
+    """
+    Finds the host_status of the host
+    :param blend: The blend from the instanciated config.json
+    :param hostname: The hostname of the host, e.g. 'podnet-a'
+    :param mountable: True if the CIDATA USB is mounted, the host is then installed rather than validated
+    :param podnet_b_enabled: podnet_b_enabled from the CIDATA config.json, a podnet-a being installed again with
+                             podnet_b enabled is reinstalled
+    :return: The host_status, 0 if the host matches none
+    """
+    if blend not in BLENDS or hostname not in HOSTNAMES:
+        return 0
+    hostname = HOSTNAMES[hostname]
+    if mountable is not True:
+        status = validate
+    elif hostname == podnet_a and podnet_b_enabled is not False:
+        status = reinstall
+    else:
+        status = install
+    host_status = blend + status + hostname
+    return host_status if host_status in HOST_STATUSES else 0
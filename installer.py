@@ -5,24 +5,8 @@ import os
 # libs
 # local
 import data_blob
-from installer_scripts import (
-    cop_install_appliance_a,
-    cop_install_podnet_a,
-    cop_install_podnet_b,
-    cop_reinstall_podnet_a,
-    copregion_install_appliance_a,
-    copregion_install_podnet_a,
-    copregion_install_podnet_b,
-    copregion_reinstall_podnet_a,
-    pat_install_appliance_a,
-    pat_install_podnet_a,
-    pat_install_podnet_b,
-    pat_reinstall_podnet_a,
-    region_install_appliance_a,
-    region_install_podnet_a,
-    region_install_podnet_b,
-    region_reinstall_podnet_a,
-)
+import installer_engine
+from host_status import HOST_STATUSES
 from logo import logo
 
 
@@ -230,38 +214,10 @@ def build(win, subitem, stdscr, colmid):
             win.refresh()
             win.getch()
 
-            if host_status == data_blob.cop_install_podnet_a:
-                built = cop_install_podnet_a.build(win)
-            elif host_status == data_blob.cop_install_podnet_b:
-                built = cop_install_podnet_b.build(win)
-            elif host_status == data_blob.cop_install_appliance_a:
-                built = cop_install_appliance_a.build(win)
-            elif host_status == data_blob.cop_reinstall_podnet_a:
-                built = cop_reinstall_podnet_a.build(win)
-            elif host_status == data_blob.region_install_podnet_a:
-                built = region_install_podnet_a.build(win)
-            elif host_status == data_blob.region_install_podnet_b:
-                built = region_install_podnet_b.build(win)
-            elif host_status == data_blob.region_install_appliance_a:
-                built = region_install_appliance_a.build(win)
-            elif host_status == data_blob.region_reinstall_podnet_a:
-                built = region_reinstall_podnet_a.build(win)
-            elif host_status == data_blob.copregion_install_podnet_a:
-                copregion_install_podnet_a.build(win)
-            elif host_status == data_blob.copregion_install_podnet_b:
-                built = copregion_install_podnet_b.build(win)
-            elif host_status == data_blob.copregion_install_appliance_a:
-                built = copregion_install_appliance_a.build(win)
-            elif host_status == data_blob.copregion_reinstall_podnet_a:
-                built = copregion_reinstall_podnet_a.build(win)
-            elif host_status == data_blob.pat_install_podnet_a:
-                built = pat_install_podnet_a.build(win)
-            elif host_status == data_blob.pat_install_podnet_b:
-                built = pat_install_podnet_b.build(win)
-            elif host_status == data_blob.pat_install_appliance_a:
-                built = pat_install_appliance_a.build(win)
-            elif host_status == data_blob.pat_reinstall_podnet_a:
-                built = pat_reinstall_podnet_a.build(win)
+            # Only the plan of the host_status is loaded from installer_plans
+            installer = HOST_STATUSES.get(host_status, {}).get('installer')
+            if installer is not None:
+                built = installer_engine.build(win, installer)
             else:
                 built = False
                 win.addstr(3, 1, f'Host {host_status}, is already in a configured state.', curses.color_pair(4))
@@ -0,0 +1,406 @@
+# stdlib
+import copy
+import functools
+import ipaddress
+import json
+import os
+import subprocess
+# lib
+import curses
+import yaml
+# local
+from netplan_utils import NETPLAN_FILE, NetplanBatch
+from ports import discover_interfaces
+from sql_utils import get_instanciated_infra, get_instanciated_metadata, refresh_session_constants
+
+
+__all__ = [
+    'PLAN_DIR',
+    'build',
+    'derive_addresses',
+    'fill',
+    'load_common',
+    'load_plan',
+    'update_netplan_routes',
+]
+
+# The plans of the host_statuses, one YAML file per installer name plus common.yaml
+PLAN_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'installer_plans')
+CONFIG_JSON = '/etc/cloudcix/pod/configs/config.json'
+# Width the status of a line is right aligned to
+STATUS_WIDTH = 48
+
+# Disables password access over ssh for the robot user on a PodNet
+ROBOT_SSH_PAYLOAD = """
+if ! echo "Match user robot\nPasswordAuthentication no" | sudo tee /etc/ssh/sshd_config.d/robot.conf > /dev/null 2>&1; then
+    echo "300: Failed to create /etc/ssh/sshd_config.d/robot.conf"
+    exit 1
+fi 
+if ! sudo systemctl restart ssh > /dev/null 2>&1; then
+    echo "301: Failed to restart sshd service"
+    exit 1
+fi
+echo "000: Successfully created /etc/ssh/sshd_config.d/robot.conf and restarted sshd service"
+    """
+
+
+class TaskError(Exception):
+    """Raise when a task of a step fails, the message is shown on the message line """
+
+
+@functools.lru_cache(maxsize=None)
+def load_common():
+    """
+    :return: The interfaces, firewall groups and steps shared by the plans, from common.yaml
+    """
+    with open(os.path.join(PLAN_DIR, 'common.yaml'), 'r') as file:
+        return yaml.safe_load(file)
+
+
+@functools.lru_cache(maxsize=None)
+def load_plan(name):
+    """
+    Only the plan of the host_status being built is read
+    :param name: The installer name of the host_status, e.g. 'cop_install_podnet_a'
+    :return: The plan
+    """
+    with open(os.path.join(PLAN_DIR, f'{name}.yaml'), 'r') as file:
+        plan = yaml.safe_load(file)
+    plan.setdefault('preconfigured', [])
+    plan.setdefault('interfaces', [])
+    plan.setdefault('addresses', {})
+    plan.setdefault('firewall', [])
+    plan.setdefault('tasks', [])
+    return plan
+
+
+def derive_addresses(config_data, plan):
+    """
+    :param config_data: config.json of the pod
+    :param plan: The plan being built
+    :return: placeholder -> value for the strings of common.yaml and the plan
+    """
+    primary_ipv4, primary_ipv4_prefix = config_data['primary_ipv4_subnet'].split('/')
+    ipv6_network = config_data['ipv6_subnet'].split('/')[0]
+    d0c6_network = f'{ipv6_network[:-1]}d0c6::'
+    addresses = {
+        **config_data,
+        'hostname': plan['hostname'],
+        'pod_yaml': plan.get('pod_yaml'),
+        'primary_ipv4_prefix': primary_ipv4_prefix,
+        'ipv6_network': ipv6_network,
+        'd0c6_network': d0c6_network,
+        # PodNet IPs
+        'mgmt_ipv4': f'{next(ipaddress.IPv4Network(config_data["primary_ipv4_subnet"]).hosts())}',
+        'pms1': f'{ipaddress.ip_address(primary_ipv4) + 1}',
+        # Robot IPs
+        'pod_appliance': f'{ipv6_network}6000:1',
+        'robot_ipv6': f'{d0c6_network}6001:1',
+        'robotworker_ipv6': f'{d0c6_network}6001:2',
+        # COP IPs
+        'cop_nginxcop_ipv4': f'{ipaddress.ip_address(primary_ipv4) + 4}',
+        'cop_portal_ipv4': f'{ipaddress.ip_address(primary_ipv4) + 5}',
+        'cop_nginxcop_ipv6': f'{d0c6_network}4004:a',
+        'cop_portal_ipv6': f'{d0c6_network}5002:4',
+    }
+    # Only the public0 interface of a PodNet uses the link subnets, an appliance's config.json may not have them
+    for version in ('ipv4', 'ipv6'):
+        link_subnet = config_data.get(f'{version}_link_subnet') or ''
+        if '/' in link_subnet:
+            addresses[f'{version}_link_prefix'] = link_subnet.split('/')[1]
+    # The addresses of the plan may use the ones above
+    for key, value in plan['addresses'].items():
+        addresses[key] = fill(value, addresses)
+    return addresses
+
+
+def fill(value, addresses):
+    """
+    :param value: A string, or list or dictionary of them, from common.yaml or a plan
+    :param addresses: placeholder -> value from derive_addresses()
+    :return: A copy of the value with the {placeholders} of its strings filled in
+    """
+    if isinstance(value, str):
+        return value.format_map(addresses)
+    if isinstance(value, list):
+        return [fill(item, addresses) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, addresses) for key, item in value.items()}
+    return value
+
+
+def _line(label, status='', width=STATUS_WIDTH):
+    return f'{label}{status:>{width - len(label)}}'
+
+
+def _fail(win, row, label, error, width=STATUS_WIDTH):
+    win.addstr(row, 1, _line(label, 'FAILED', width), curses.color_pair(3))
+    win.addstr(18, 1, f'Error: {error}', curses.color_pair(3))
+    win.refresh()
+    return False
+
+
+def _netplan_iflname(name):
+    """
+    :param name: The set-name of an interface configured before the installer ran, e.g. 'mgmt0'
+    :return: The logical name of the interface from netplan data, '' if it is not there
+    """
+    ethernets = get_instanciated_infra()['netplan']['network']['ethernets']
+    for interface_lname, interface_data in ethernets.items():
+        if interface_data.get('set-name', '') == name:
+            return interface_lname
+    return ''
+
+
+def update_netplan_routes(interface, route):
+    """
+    Replaces the route of the interface to the same destination, or adds it, and applies the netplan config
+    :param interface: The logical name of the interface
+    :param route: The new route as a {'to': ..., 'via': ...} dictionary
+    :return: success, message
+    """
+    # The session constants are shared so work on a copy
+    netplan_config = copy.deepcopy(get_instanciated_infra()['netplan'])
+    ethernets = netplan_config['network']['ethernets']
+    if interface not in ethernets:
+        return False, f'Interface {interface} not found in the netplan configuration.'
+
+    routes = ethernets[interface].setdefault('routes', [])
+    existing = next((item for item in routes if item.get('to') == route['to']), None)
+    if existing is None:
+        routes.append(route)
+    else:
+        existing.update(route)
+
+    with open(NETPLAN_FILE, 'w') as file:
+        yaml.safe_dump(netplan_config, file, default_flow_style=False)
+    refresh_session_constants()
+
+    try:
+        subprocess.run(
+            'sudo netplan apply > /dev/null 2>&1',
+            shell=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as error:
+        return False, f'Error occurred while applying netplan configuration: {error}'
+    return True, f'Applied updated netplan configuration for {interface}.'
+
+
+##  Steps  ##
+# Each step is called with the window, plan, addresses and the logical interface names found so far, and returns
+# True when it succeeded
+
+def network(win, plan, addresses, iflnames):
+    """
+    1 Connects the interfaces of the plan and configures them with a single netplan apply
+    """
+    interfaces = load_common()['interfaces']
+    # 1.0 Connect all the interfaces at once, each is assigned to its role by interface_roles in config.json
+    # or else in the order they are connected
+    roles = [(name, interfaces[name]['row'], interfaces[name]['label']) for name in plan['interfaces']]
+    excluded_ifaces = ['lo', 'docker', *plan['preconfigured']]
+    discovered = discover_interfaces(win, roles, excluded_ifaces, addresses.get('interface_roles'))
+
+    netplan = NetplanBatch()
+    for name in plan['interfaces']:
+        iflname, mac = discovered[name]
+        iflnames[name] = iflname
+        netplan.add(
+            identifier=iflname,
+            ips=fill(interfaces[name].get('ips'), addresses),
+            mac=mac,
+            name=name,
+            routes=fill(interfaces[name].get('routes'), addresses),
+        )
+    for name, interface in interfaces.items():
+        if name not in plan['interfaces'] and name not in plan['preconfigured']:
+            win.addstr(interface['row'], 1, f'{interface["label"]} N/A', curses.color_pair(2))
+
+    # 1.6 Apply the netplan config of all the interfaces with a single netplan apply
+    configured, error = netplan.apply()
+    if configured is False:
+        for _, row, label in roles:
+            win.addstr(row, 1, f'{label}FAILED', curses.color_pair(3))
+        win.addstr(18, 1, f'Error: {error}', curses.color_pair(3))
+        win.refresh()
+        return False
+    for _, row, label in roles:
+        win.addstr(row, 1, f'{label}CONFIGURED', curses.color_pair(4))
+    refresh_session_constants()
+    return True
+
+
+def config_json(win, plan, addresses, iflnames):
+    """
+    2 Updates the logical interface names of the host in config.json
+    """
+    # 2.1.1 Find the logical interface names of the preconfigured interfaces from netplan data
+    for name in plan['preconfigured']:
+        iflnames[name] = _netplan_iflname(name)
+
+    # 2.1.2 Create dictionary for interfaces to update config.json with logical names, e.g. podnet_b_mgmt_ifname
+    logical_ifnames = {
+        f'{plan["hostname"]}_{name.rstrip("0")}_ifname': iflname for name, iflname in iflnames.items()
+    }
+    with open(CONFIG_JSON, 'r') as file:
+        config = json.load(file)
+    updated_config = {key: logical_ifnames.get(key, val) for key, val in config.items()}
+    with open(CONFIG_JSON, 'w') as file:
+        json.dump(updated_config, file, indent=4)
+    refresh_session_constants()
+    win.addstr(1, 1, _line(load_common()['steps']['config_json']['title'], 'SUCCESS'), curses.color_pair(4))
+    return True
+
+
+def firewall(win, plan, addresses, iflnames):
+    """
+    3 Configures the firewall rules of the groups of the plan
+    """
+    # 3.1 Prepare Firewall rules
+    win.addstr(2, 1, _line('3.1 Preparing Firewall Rules:'), curses.color_pair(2))
+    win.refresh()
+    groups = load_common()['firewall']
+    firewall_rules = sorted(
+        (fill(rule, addresses) for group in plan['firewall'] for rule in groups[group]),
+        key=lambda rule: rule['order'],
+    )
+    win.addstr(2, 1, _line('3.1 Preparing Firewall Rules:', 'SUCCESS'), curses.color_pair(4))
+
+    # 3.2 Apply Firewall rules
+    win.addstr(3, 1, _line('3.2 Configuring Firewall Rules:'), curses.color_pair(2))
+    win.refresh()
+    from primitives import firewall_podnet
+    configured, error = firewall_podnet.build(
+        firewall_rules=firewall_rules,
+        log_setup=None,
+    )
+    if configured is False:
+        return _fail(win, 3, '3.2 Configuring Firewall Rules:', error)
+    win.addstr(3, 1, _line('3.2 Configuring Firewall Rules:', 'SUCCESS'), curses.color_pair(4))
+    return True
+
+
+STEPS = {
+    'network': network,
+    'config_json': config_json,
+    'firewall': firewall,
+}
+
+
+##  Tasks  ##
+# The steps without a function above run their tasks from common.yaml, a task does the actions it has in the
+# order below and raises TaskError when one fails
+
+def _write(action, iflnames):
+    try:
+        with open(action['path'], 'w') as file:
+            file.write(action['content'])
+    except OSError as error:
+        raise TaskError(error)
+
+
+def _run(command, iflnames):
+    try:
+        subprocess.run(command, shell=True, check=True)
+    except subprocess.CalledProcessError as error:
+        raise TaskError(error)
+
+
+def _cron(action, iflnames):
+    from crontab import CronTab
+    with CronTab(user='root') as cron:
+        if len(list(cron.find_command(action['find']))) == 0:
+            job = cron.new(action['command'])
+            job.setall(action['schedule'])
+
+
+def _robot_ssh(podnet_ip, iflnames):
+    from cloudcix.rcc import deploy_ssh, CouldNotExecuteException
+    try:
+        stdout, stderr = deploy_ssh(
+            host_ip=podnet_ip,
+            payload=ROBOT_SSH_PAYLOAD,
+            username='robot',
+        )
+    except CouldNotExecuteException as error:
+        raise TaskError(error)
+    if not stdout or '000' not in stdout:
+        raise TaskError(stderr)
+
+
+def _route(action, iflnames):
+    interface = iflnames.get(action['interface']) or _netplan_iflname(action['interface'])
+    success, error = update_netplan_routes(interface, {'to': action['to'], 'via': action['via']})
+    if success is False:
+        raise TaskError(error)
+
+
+ACTIONS = {
+    'write': _write,
+    'run': _run,
+    'cron': _cron,
+    'robot_ssh': _robot_ssh,
+    'route': _route,
+}
+
+
+def run_tasks(win, step, plan, addresses, iflnames):
+    """
+    Runs the tasks of the step that the plan lists, the others are shown as N/A
+    :param step: The step from common.yaml
+    :return: True if all the tasks succeeded
+    """
+    for row, (task_id, task) in enumerate(step['tasks'].items(), start=2):
+        label = task['label']
+        width = task.get('width', STATUS_WIDTH)
+        if task_id not in plan['tasks']:
+            win.addstr(row, 1, _line(label, 'N/A', width), curses.color_pair(2))
+            continue
+        win.addstr(row, 1, _line(label, '', width), curses.color_pair(2))
+        win.refresh()
+        try:
+            for key, action in ACTIONS.items():
+                if key in task:
+                    action(fill(task[key], addresses), iflnames)
+        except TaskError as error:
+            return _fail(win, row, label, error, width)
+        win.addstr(row, 1, _line(label, 'SUCCESS', width), curses.color_pair(4))
+        win.refresh()
+    return True
+
+
+def build(win, name):
+    """
+    Builds the host with the plan of its host_status
+    :param win: The window of the installer
+    :param name: The installer name of the host_status, e.g. 'cop_install_podnet_a'
+    :return: True if every step of the plan succeeded
+    """
+    plan = load_plan(name)
+    steps = load_common()['steps']
+    addresses = derive_addresses(get_instanciated_metadata()['config.json'], plan)
+    # Logical interface names by set-name, filled in by the steps
+    iflnames = {}
+    for index, step_name in enumerate(plan['steps']):
+        step = steps[step_name]
+        if index > 0:
+            prompt = f'Please press ENTER to continue {step["name"]} block.'
+            win.addstr(18, 1, f'{prompt:<60}', curses.color_pair(2))
+            win.refresh()
+            user_input = win.getkey()
+            while user_input != '\n':
+                user_input = win.getkey()
+            win.clear()
+
+        win.addstr(1, 1, _line(step['title']), curses.color_pair(2))
+        win.refresh()
+        if step_name in STEPS:
+            built = STEPS[step_name](win, plan, addresses, iflnames)
+        else:
+            built = run_tasks(win, step, plan, addresses, iflnames)
+        if built is False:
+            return False
+
+    # Finish
+    return True
@@ -1,7 +1,117 @@
+# stdlib
+import os
+import queue
+import select
+import socket
+import struct
+import subprocess
+import threading
+import time
+# lib
+# local
+
+
 __all__ = [
+    'FakeLinkSource',
+    'INTERFACE_FILES',
+    'InterfaceSnapshot',
+    'NetlinkLinkSource',
+    'SNAPSHOT_TTL',
+    'find_new_iface',
+    'get_interface_snapshot',
+    'match_interface_role',
+    'open_link_source',
+    'parse_link_messages',
     'read_interface_file',
+    'read_lldp_neighbors',
+    'scan_for_new_iface',
+    'wait_for_new_iface',
 ]
 
+SYS_NET_DIR = '/sys/class/net/'
+# The files of each interface captured by an InterfaceSnapshot
+INTERFACE_FILES = ('operstate', 'carrier', 'address', 'speed', 'mtu')
+# Seconds a shared InterfaceSnapshot is reused before sysfs is read again
+SNAPSHOT_TTL = 2
+
+# rtnetlink constants from linux/rtnetlink.h and linux/if_link.h
+RTMGRP_LINK = 1
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IFLA_CARRIER = 33
+IFF_LOWER_UP = 0x10000
+# IF_OPER_* values as the strings sysfs shows in operstate
+OPERSTATES = ('unknown', 'notpresent', 'down', 'lowerlayerdown', 'testing', 'dormant', 'up')
+NLMSG_HEADER = struct.Struct('=LHHLL')
+IFINFOMSG = struct.Struct('=BxHiII')
+RTATTR = struct.Struct('=HH')
+
+# The shared snapshot, replaced once it is older than its TTL
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _read_file(name, file_name):
+    try:
+        with open(f'{SYS_NET_DIR}{name}/{file_name}') as file:
+            content = file.read().strip()
+    except OSError:
+        # Missing files and files the kernel refuses to read, e.g. carrier of an interface that is admin down
+        content = 'Not Found'
+    return content
+
+
+class InterfaceSnapshot:
+    """
+    The INTERFACE_FILES of every interface in /sys/class/net read in one pass
+    """
+
+    def __init__(self):
+        self.taken = time.monotonic()
+        self.interfaces = {}
+        try:
+            names = sorted(os.listdir(SYS_NET_DIR))
+        except OSError:
+            names = []
+        for name in names:
+            self.interfaces[name] = {file_name: _read_file(name, file_name) for file_name in INTERFACE_FILES}
+
+    def age(self):
+        """
+        :return: Seconds since the snapshot was taken
+        """
+        return time.monotonic() - self.taken
+
+    def names(self):
+        """
+        :return: The names of the interfaces on the host in sorted order
+        """
+        return list(self.interfaces)
+
+    def get(self, name, file_name):
+        """
+        :param name: Interface name on host
+        :param file_name: The name of the file of the interface, one of INTERFACE_FILES
+        :return: The content of the file of the interface or 'Not Found'
+        """
+        return self.interfaces.get(name, {}).get(file_name, 'Not Found')
+
+
+def get_interface_snapshot(ttl=SNAPSHOT_TTL, refresh=False):
+    """
+    :param ttl: Seconds the shared snapshot may be reused for
+    :param refresh: Read sysfs again even if the shared snapshot is within its TTL
+    :return: The shared InterfaceSnapshot
+    """
+    global _snapshot
+    with _snapshot_lock:
+        if refresh or _snapshot is None or _snapshot.age() > ttl:
+            _snapshot = InterfaceSnapshot()
+        return _snapshot
+
 
 def read_interface_file(name, file_name):
     """
@@ -9,9 +119,247 @@ def read_interface_file(name, file_name):
     :param file_name: The name of the file of the interface to read
     :return: The content of the filename of the interface
     """
+    if file_name in INTERFACE_FILES:
+        return get_interface_snapshot().get(name, file_name)
+    return _read_file(name, file_name)
+
+
+def scan_for_new_iface(excluded_ifaces):
+    """
+    Scan /sys/class/net/ directory for new network interface.
+    :param excluded_ifaces: Interface names that are already assigned
+    :return: The name and mac address of the first interface that is up with a carrier, ('', None) if there is none
+    """
+    snapshot = get_interface_snapshot(refresh=True)
+    for name in snapshot.names():
+        if name in excluded_ifaces:
+            continue
+        if snapshot.get(name, 'operstate') == 'up' and snapshot.get(name, 'carrier') == '1':
+            return name, snapshot.get(name, 'address')
+    return '', None
+
+
+##  Link Events  ##
+# A link event is a dictionary of the interface name, operstate and carrier as sysfs shows them, the mac address
+# and whether the interface was removed, e.g.
+#   {'name': 'eno1', 'operstate': 'up', 'carrier': '1', 'address': '3c:ec:ef:00:00:01', 'removed': False}
+
+def parse_link_messages(data):
+    """
+    Parses RTM_NEWLINK and RTM_DELLINK messages received on a NETLINK_ROUTE socket, other messages are skipped
+    :param data: The bytes of one recv() on the socket
+    :return: A list of link events
+    """
+    events = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, message_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        if message_type in (RTM_NEWLINK, RTM_DELLINK):
+            body = offset + NLMSG_HEADER.size
+            _, _, _, flags, _ = IFINFOMSG.unpack_from(data, body)
+            event = {
+                'name': None,
+                'operstate': 'unknown',
+                'carrier': '1' if flags & IFF_LOWER_UP else '0',
+                'address': None,
+                'removed': message_type == RTM_DELLINK,
+            }
+            attribute = body + IFINFOMSG.size
+            while attribute + RTATTR.size <= offset + length:
+                attribute_length, attribute_type = RTATTR.unpack_from(data, attribute)
+                if attribute_length < RTATTR.size:
+                    break
+                value = data[attribute + RTATTR.size:attribute + attribute_length]
+                if attribute_type == IFLA_IFNAME:
+                    event['name'] = value.rstrip(b'\0').decode()
+                elif attribute_type == IFLA_OPERSTATE and value:
+                    event['operstate'] = OPERSTATES[value[0]] if value[0] < len(OPERSTATES) else 'unknown'
+                elif attribute_type == IFLA_CARRIER and value:
+                    event['carrier'] = str(value[0])
+                elif attribute_type == IFLA_ADDRESS:
+                    event['address'] = ':'.join(f'{byte:02x}' for byte in value)
+                # Attributes are aligned to 4 bytes
+                attribute += (attribute_length + 3) & ~3
+            if event['name'] is not None:
+                events.append(event)
+        offset += (length + 3) & ~3
+    return events
+
+
+class NetlinkLinkSource:
+    """
+    Link events from the kernel, read from a NETLINK_ROUTE socket subscribed to the link group
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.sock.bind((0, RTMGRP_LINK))
+        # Set when events were dropped, the reader must scan sysfs for what it missed
+        self.lost = False
+
+    def read(self, timeout):
+        """
+        :param timeout: Seconds to wait for an event
+        :return: The link events received, empty if there were none within the timeout or they were lost,
+                 lost is set in the latter case
+        """
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = self.sock.recv(65536)
+        except OSError:
+            # ENOBUFS when a burst of events overflowed the receive buffer
+            self.lost = True
+            return []
+        return parse_link_messages(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class FakeLinkSource:
+    """
+    Link events pushed by hand, in place of a NetlinkLinkSource for testing
+    """
+
+    def __init__(self, events=()):
+        self.events = queue.Queue()
+        # Set by hand to act as a NetlinkLinkSource that dropped events
+        self.lost = False
+        for event in events:
+            self.push(event)
+
+    def push(self, event):
+        """
+        :param event: The link event to be read next, missing keys take the values of an interface that is up
+        """
+        self.events.put({'operstate': 'up', 'carrier': '1', 'address': None, 'removed': False, **event})
+
+    def read(self, timeout):
+        """
+        :param timeout: Seconds to wait for an event
+        :return: The link events pushed, empty if there were none within the timeout
+        """
+        try:
+            events = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while not self.events.empty():
+            events.append(self.events.get_nowait())
+        return events
+
+    def close(self):
+        pass
+
+
+def open_link_source():
+    """
+    :return: A NetlinkLinkSource, None if netlink is not available
+    """
     try:
-        with open(f'/sys/class/net/{name}/{file_name}') as file:
-            content = file.read().strip()
-    except FileNotFoundError:
-        content = 'Not Found'
-    return content
+        return NetlinkLinkSource()
+    except OSError:
+        return None
+
+
+def find_new_iface(events, excluded_ifaces):
+    """
+    :param events: Link events
+    :param excluded_ifaces: Interface names that are already assigned
+    :return: The name and mac address of the first interface in the events that came up with a carrier,
+             ('', None) if there is none
+    """
+    for event in events:
+        if event['removed'] or event['name'] in excluded_ifaces:
+            continue
+        if event['operstate'] == 'up' and event['carrier'] == '1':
+            address = event['address'] or get_interface_snapshot(refresh=True).get(event['name'], 'address')
+            return event['name'], address
+    return '', None
+
+
+def wait_for_new_iface(excluded_ifaces, source, timeout=None, poll=0.5, on_events=None):
+    """
+    Waits for an interface that is not excluded to come up with a carrier. Interfaces already up are found by a
+    scan of sysfs first, after that the link events from the source are watched so the interface is found as
+    soon as its link comes up. If the source dropped events sysfs is scanned again.
+    :param excluded_ifaces: Interface names that are already assigned
+    :param source: A NetlinkLinkSource or FakeLinkSource
+    :param timeout: Seconds to wait, None to wait until an interface comes up
+    :param poll: Seconds to wait on the source at a time, on_events is called at least this often
+    :param on_events: Called with the list of link events after each wait on the source, return True to stop waiting
+    :return: The name and mac address of the interface, ('', None) if none came up within the timeout or
+             on_events stopped the wait
+    """
+    name, mac = scan_for_new_iface(excluded_ifaces)
+    if name != '':
+        return name, mac
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = poll if deadline is None else min(poll, max(0, deadline - time.monotonic()))
+        events = source.read(wait)
+        if source.lost:
+            # Events were dropped so an interface may have come up unseen, scan sysfs again
+            source.lost = False
+            name, mac = scan_for_new_iface(excluded_ifaces)
+        else:
+            name, mac = find_new_iface(events, excluded_ifaces)
+        if name != '':
+            return name, mac
+        if on_events is not None and on_events(events):
+            return '', None
+        if deadline is not None and time.monotonic() >= deadline:
+            return '', None
+
+
+##  Interface Roles  ##
+# A rule picks out the interface for a role, e.g. from interface_roles in config.json
+#   {'oob0': {'mac_prefix': '3c:ec:ef'}, 'inter0': {'lldp': {'chassis.name': 'inter-switch'}}}
+# mac_prefix must match the start of the mac address and every key of lldp must match the LLDP neighbor
+
+def read_lldp_neighbors():
+    """
+    :return: The LLDP neighbor of each interface as reported by lldpd,
+             e.g. {'eno1': {'chassis.name': 'oob-switch', 'port.ifname': 'Ethernet12'}},
+             empty if lldpd is not installed or not running
+    """
+    try:
+        output = subprocess.run(
+            ['lldpctl', '-f', 'keyvalue'], capture_output=True, text=True, timeout=5,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    neighbors = {}
+    for line in output.splitlines():
+        # lldp.<interface>.<key>=<value>
+        key, _, value = line.partition('=')
+        parts = key.split('.', 2)
+        if len(parts) == 3 and parts[0] == 'lldp':
+            neighbors.setdefault(parts[1], {})[parts[2]] = value
+    return neighbors
+
+
+def match_interface_role(mac, neighbor, rules, roles):
+    """
+    :param mac: The mac address of the interface
+    :param neighbor: The LLDP neighbor of the interface from read_lldp_neighbors(), empty if it is not known
+    :param rules: role -> rule
+    :param roles: The roles not assigned yet, in order
+    :return: The first role whose rule matches the interface, else the first role without a rule,
+             None if there is neither
+    """
+    for role in roles:
+        rule = rules.get(role)
+        if not rule:
+            continue
+        prefix = rule.get('mac_prefix')
+        if prefix is not None and not (mac or '').lower().startswith(prefix.lower()):
+            continue
+        if any(neighbor.get(key) != value for key, value in rule.get('lldp', {}).items()):
+            continue
+        return role
+    return next((role for role in roles if not rules.get(role)), None)
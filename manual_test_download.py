@@ -0,0 +1,125 @@
+# stdlib
+import gzip
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+# lib
+# local
+import robosoc
+
+#################################################################################
+#  Test download_ipblocklist() against a local HTTP stand-in   (Run by hand,    #
+#            the server listens on 127.0.0.1 and files go to a temp directory)  #
+#################################################################################
+#  i)    200        A new list is written with the ETag and Last-Modified       #
+#  ii)   304        The stored ETag is sent and the server answers unchanged    #
+#  iii)  gzip       A gzip body is decompressed to the candidate file           #
+#  iv)   Published  The download stops at a Published line that is not newer    #
+#  v)    truncated  A body cut short of its Content-Length is a failure         #
+#  vi)   truncated  A gzip body cut short is a failure                          #
+#################################################################################
+
+ETAG = '"robosoc-1"'
+LAST_MODIFIED = 'Thu, 01 Feb 2024 10:00:00 GMT'
+BLOCKLIST = (
+    b'# RoboSOC ipblocklist\n'
+    b'# Published @ 10:00:00 01/02/24\n'
+    + b''.join(f'10.0.{index // 256}.{index % 256}\n'.encode() for index in range(2000))
+)
+
+
+class StandIn(BaseHTTPRequestHandler):
+    # Set by each case: '200', 'gzip', 'truncated' or 'truncated_gzip'
+    mode = '200'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = BLOCKLIST
+        if StandIn.mode in ('gzip', 'truncated_gzip'):
+            body = gzip.compress(BLOCKLIST)
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        if StandIn.mode in ('gzip', 'truncated_gzip'):
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if StandIn.mode.startswith('truncated'):
+            # Close the connection part way through the body
+            body = body[:50]
+        try:
+            for start in range(0, len(body), 1024):
+                self.wfile.write(body[start:start + 1024])
+                self.wfile.flush()
+        except OSError:
+            # The client stopped reading
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def reset(path):
+    for name in os.listdir(path):
+        os.remove(os.path.join(path, name))
+
+
+def main():
+    server = HTTPServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/ipblocklist.txt'
+    with tempfile.TemporaryDirectory() as directory:
+        path = f'{directory}/'
+        candidate = f'{path}candidate_ipblocklist.txt'
+        candidate_meta = f'{path}candidate_ipblocklist.meta.json'
+
+        StandIn.mode = '200'
+        assert robosoc.download_ipblocklist('ipblocklist', path, url) is True
+        with open(candidate, 'rb') as file:
+            assert file.read() == BLOCKLIST
+        with open(candidate_meta, 'r') as file:
+            assert json.load(file) == {'etag': ETAG, 'last_modified': LAST_MODIFIED}
+        print('i)     200        passed')
+
+        # Promote the candidate the way process_robosoc_ipblocklist() does
+        os.replace(candidate, f'{path}active_ipblocklist.txt')
+        os.replace(candidate_meta, f'{path}active_ipblocklist.meta.json')
+        assert robosoc.download_ipblocklist('ipblocklist', path, url) is False
+        assert not os.path.exists(candidate)
+        print('ii)    304        passed')
+
+        reset(path)
+        StandIn.mode = 'gzip'
+        assert robosoc.download_ipblocklist('ipblocklist', path, url) is True
+        with open(candidate, 'rb') as file:
+            assert file.read() == BLOCKLIST
+        print('iii)   gzip       passed')
+
+        # An active list with the same Published datetime but no ETag, so the server sends the body
+        reset(path)
+        StandIn.mode = '200'
+        with open(f'{path}active_ipblocklist.txt', 'wb') as file:
+            file.write(BLOCKLIST)
+        assert robosoc.download_ipblocklist('ipblocklist', path, url) is False
+        assert not os.path.exists(candidate)
+        assert not os.path.exists(candidate_meta)
+        print('iv)    Published  passed')
+
+        for number, mode in (('v)', 'truncated'), ('vi)', 'truncated_gzip')):
+            reset(path)
+            StandIn.mode = mode
+            assert robosoc.download_ipblocklist('ipblocklist', path, url) is None
+            assert not os.path.exists(candidate)
+            assert not os.path.exists(candidate_meta)
+            print(f'{number:<7}truncated  passed')
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+# stdlib
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+# lib
+import yaml
+# local
+
+
+__all__ = [
+    'NETPLAN_FILE',
+    'NetplanBatch',
+    'render_netplan',
+]
+
+NETPLAN_FILE = '/etc/netplan/00-installer-config.yaml'
+
+
+def render_netplan(base, interfaces):
+    """
+    Merges the interfaces into a netplan config. An interface replaces the entry of its identifier and any other
+    entry that was given the same set-name, the rest of the config is kept as it is.
+    :param base: The netplan config to merge into, as loaded from NETPLAN_FILE
+    :param interfaces: identifier -> ethernets entry of each interface
+    :return: The merged netplan config
+    """
+    config = copy.deepcopy(base) if base else {}
+    network = config.setdefault('network', {})
+    network.setdefault('version', 2)
+    ethernets = network.setdefault('ethernets', {})
+    for identifier, entry in interfaces.items():
+        stale = [
+            name for name, data in ethernets.items()
+            if name != identifier and (data or {}).get('set-name') == entry['set-name']
+        ]
+        for name in stale:
+            del ethernets[name]
+        ethernets[identifier] = entry
+    return config
+
+
+class NetplanBatch:
+    """
+    The interfaces of an install collected into one netplan config, written and applied once by apply()
+    """
+
+    def __init__(self, path=NETPLAN_FILE):
+        """
+        :param path: The netplan file to merge the interfaces into
+        """
+        self.path = path
+        self.interfaces = {}
+
+    def add(self, identifier, mac, name, ips=None, routes=None):
+        """
+        Adds an interface to the batch, takes the same arguments as net.build
+        :param identifier: The name of the interface on the host, e.g. 'eno1'
+        :param mac: The mac address of the interface
+        :param name: The name the interface is given, e.g. 'mgmt0'
+        :param ips: The addresses of the interface with prefix lengths, None for none
+        :param routes: The routes of the interface as {'to': ..., 'via': ...} dictionaries, None for none
+        """
+        entry = {'match': {'macaddress': mac}, 'set-name': name}
+        if ips:
+            entry['addresses'] = list(ips)
+        if routes:
+            entry['routes'] = [dict(route) for route in routes]
+        self.interfaces[identifier] = entry
+
+    def read(self):
+        """
+        :return: The content of the netplan file, None if it does not exist
+        """
+        try:
+            with open(self.path, 'r') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def render(self):
+        """
+        Dry run of apply(), nothing is written
+        :return: The merged netplan YAML
+        """
+        base = yaml.safe_load(self.read() or '') or {}
+        config = render_netplan(base, self.interfaces)
+        return yaml.safe_dump(config, default_flow_style=False, sort_keys=False)
+
+    def apply(self):
+        """
+        Writes the merged netplan config and applies it with a single `netplan apply`. The previous file is put back
+        if netplan rejects the config.
+        :return: configured, error as net.build returns them
+        """
+        previous = self.read()
+        rendered = self.render()
+        temp_path = f'{self.path}.tmp'
+        try:
+            with open(temp_path, 'w') as file:
+                file.write(rendered)
+            # netplan warns about config files that other users can read
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            return False, f'Could not write {self.path}: {e}'
+
+        for command in (['netplan', 'generate'], ['netplan', 'apply']):
+            try:
+                process = subprocess.run(command, capture_output=True, text=True)
+            except OSError as e:
+                error = str(e)
+            else:
+                if process.returncode == 0:
+                    continue
+                error = process.stderr.strip() or f'exit status {process.returncode}'
+            self._restore(previous, reapply=command[1] == 'apply')
+            return False, f'`{" ".join(command)}` failed: {error}'
+        return True, None
+
+    def _restore(self, previous, reapply):
+        if previous is None:
+            os.remove(self.path)
+        else:
+            with open(self.path, 'w') as file:
+                file.write(previous)
+        if reapply:
+            # A failed apply may have left part of the new config live
+            try:
+                subprocess.run(['netplan', 'apply'], capture_output=True)
+            except OSError:
+                pass
+
+
+def main(argv=None):
+    """
+    Prints the netplan YAML that a batch of interfaces would be applied as, without touching the host
+    """
+    parser = argparse.ArgumentParser(description='Render the merged netplan config of a batch of interfaces.')
+    parser.add_argument(
+        'interfaces',
+        help='JSON file with a list of interfaces, each with the arguments of net.build',
+    )
+    parser.add_argument(
+        '--netplan-file',
+        default=NETPLAN_FILE,
+        help='The netplan file to merge the interfaces into',
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.interfaces, 'r') as file:
+        interfaces = json.load(file)
+    batch = NetplanBatch(args.netplan_file)
+    for interface in interfaces:
+        batch.add(
+            identifier=interface['identifier'],
+            ips=interface.get('ips'),
+            mac=interface['mac'],
+            name=interface['name'],
+            routes=interface.get('routes'),
+        )
+    sys.stdout.write(batch.render())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
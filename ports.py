@@ -1,20 +1,30 @@
 # stdlib
 import curses
-import os
 # libs
 # local
-from interface_utils import read_interface_file
+from interface_utils import (
+    FakeLinkSource,
+    get_interface_snapshot,
+    match_interface_role,
+    open_link_source,
+    read_lldp_neighbors,
+    wait_for_new_iface,
+)
+
+# Seconds between redraws while waiting for an interface to be connected
+LINK_POLL = 0.5
 
 
 def ports(win):
-    # ethernet ports
-    ports = os.listdir('/sys/class/net/')
+    # ethernet ports, read from sysfs in one pass
+    snapshot = get_interface_snapshot()
+    ports = snapshot.names()
     win.addstr(2, 35, ' Ethernet Ports:      Connected:     Status:      ', curses.color_pair(5))
     i = 0  # if no ethernet ports are detected i will be undefined and will crash win(addstr) after for loop
     for i, port in enumerate(ports):
         win.addstr(4 + i, 36, port)
         # is there a network cable is connected with network card
-        status = read_interface_file(port, 'carrier')
+        status = snapshot.get(port, 'carrier')
         if '1' in status:
             win.addstr(4 + i, 57, ' up        ', curses.color_pair(4))
         elif '0' in status:
@@ -22,7 +32,7 @@ def ports(win):
         else:
             win.addstr(4 + i, 57, ' unknown   ', curses.color_pair(3))
         # is the ethernet port up or down?
-        state = read_interface_file(port, 'operstate')
+        state = snapshot.get(port, 'operstate')
         if 'up' in state:
             win.addstr(4 + i, 72, ' up        ', curses.color_pair(4))
         elif 'down' in state:
@@ -32,3 +42,104 @@ def ports(win):
 
     win.addstr(6 + i, 36, f' {str(len(ports))} ethernet ports found                         ', curses.color_pair(5))
     win.refresh()
+
+
+def discover_interfaces(win, roles, excluded_ifaces, rules=None, source=None, confirm=True):
+    """
+    Watches all the unassigned ports at once, so the interfaces for every role can be connected in one go and in any
+    order. Each interface is assigned to a role as soon as its link comes up, by the rules if it matches one or else
+    to the first role without a rule. ENTER scans sysfs again, and if netlink is not available sysfs is scanned every
+    LINK_POLL.
+    :param win: The curses window
+    :param roles: The name, label row and label of each interface to connect, e.g. ('mgmt0', 2, '1.2 Management:')
+    :param excluded_ifaces: Interface names that are already assigned
+    :param rules: role -> rule for match_interface_role(), e.g. interface_roles from config.json
+    :param source: The source of link events, a NetlinkLinkSource is opened if None
+    :param confirm: Show the assignments and wait for the user to confirm them once every role is assigned
+    :return: role -> name and mac address of the interface assigned to it
+    """
+    rules = rules or {}
+    labels = {role: (row, label) for role, row, label in roles}
+    link_source = source if source is not None else open_link_source()
+    poll_sysfs = link_source is None
+    if poll_sysfs:
+        # Never has events so the wait below only times out and sysfs is scanned again
+        link_source = FakeLinkSource()
+
+    def on_events(events):
+        if events:
+            get_interface_snapshot(refresh=True)
+            ports(win)
+        enter = False
+        key = win.getch()
+        while key != -1:
+            enter = enter or key == ord('\n')
+            key = win.getch()
+        return enter or poll_sysfs
+
+    win.nodelay(True)
+    try:
+        while True:
+            assigned = {}
+            connected = list(excluded_ifaces)
+            for role, row, label in roles:
+                win.addstr(row, 1, f'{label}{" " * len("CONNECTED")}', curses.color_pair(2))
+            while len(assigned) < len(roles):
+                waiting = [role for role, _, _ in roles if role not in assigned]
+                ports(win)
+                names = ' '.join(f'`{role}`' for role in waiting)
+                win.addstr(18, 1, f'Please connect {names} (ENTER to scan again).'.ljust(60), curses.color_pair(2))
+                win.refresh()
+                iflname, mac = wait_for_new_iface(connected, link_source, poll=LINK_POLL, on_events=on_events)
+                if iflname == '':
+                    continue
+                connected.append(iflname)
+                role = match_interface_role(mac, read_lldp_neighbors().get(iflname, {}), rules, waiting)
+                if role is None:
+                    message = f'The {iflname} interface matches none of the interface roles.'
+                    win.addstr(19, 1, message.ljust(60), curses.color_pair(3))
+                    continue
+                assigned[role] = (iflname, mac)
+                row, label = labels[role]
+                win.addstr(row, 1, f'{label}CONNECTED', curses.color_pair(4))
+
+            if not confirm:
+                break
+            ports(win)
+            detected = ' '.join(f'`{role}`:{assigned[role][0]}' for role, _, _ in roles)
+            win.addstr(18, 1, f'Detected {detected}'.ljust(60), curses.color_pair(4))
+            message = 'Press ENTER to confirm, or unplug the cables and press R to connect them again.'
+            win.addstr(19, 1, message.ljust(60), curses.color_pair(2))
+            win.refresh()
+            win.nodelay(False)
+            user_input = win.getkey()
+            while user_input not in ('\n', 'r', 'R'):
+                user_input = win.getkey()
+            win.nodelay(True)
+            win.addstr(19, 1, ' ' * len(message))
+            if user_input == '\n':
+                break
+    finally:
+        win.nodelay(False)
+        if source is None:
+            link_source.close()
+    return assigned
+
+
+def connect_interface(win, name, row, label, excluded_ifaces, source=None):
+    """
+    Asks the user to connect one interface and waits for its link to come up
+    :param win: The curses window
+    :param name: The name the interface will be given, e.g. 'mgmt0'
+    :param row: The row of the label of the interface
+    :param label: The label of the interface, e.g. '1.2 Management:'
+    :param excluded_ifaces: Interface names that are already assigned
+    :param source: The source of link events, a NetlinkLinkSource is opened if None
+    :return: The name and mac address of the connected interface
+    """
+    iflname, mac = discover_interfaces(win, [(name, row, label)], excluded_ifaces, source=source, confirm=False)[name]
+    get_interface_snapshot(refresh=True)
+    ports(win)
+    win.addstr(18, 1, f'The `{name}`:{iflname} interface detected.'.ljust(60), curses.color_pair(4))
+    win.refresh()
+    return iflname, mac
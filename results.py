@@ -0,0 +1,79 @@
+# stdlib
+import threading
+# lib
+# local
+from sql_utils import update_test_details
+
+
+__all__ = [
+    'ResultAccumulator',
+]
+
+
+class ResultAccumulator:
+    """
+    In-memory copy of the test_details row for one data_blob() run.
+    Tests read and update the accumulator instead of installer.db and the row is written once by flush().
+    In write_through mode every update is also written to installer.db so a crashed run leaves its partial results
+    behind for inspection.
+    """
+
+    def __init__(self, number_of_tests, fail=0b0, ignore=0b0, warn=0b0, write_through=False):
+        """
+        :param number_of_tests: The number of tests, one result slot per test_id
+        :param fail: Map of tests that fail for the host_status
+        :param ignore: Map of tests that are ignored for the host_status
+        :param warn: Map of tests that warn for the host_status
+        :param write_through: Write every update to installer.db as well as memory
+        """
+        self.result = ['' for _ in range(number_of_tests)]
+        self.fail = fail
+        self.ignore = ignore
+        self.warn = warn
+        self.fail_map = 0b0
+        self.warn_map = 0b0
+        self.ignore_map = 0b0
+        self.pass_map = 0b0
+        self.write_through = write_through
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        :return: A copy of the test details in the order of sql_utils.get_test_details()
+        """
+        with self._lock:
+            return (
+                list(self.result), self.fail, self.ignore, self.warn, self.fail_map, self.warn_map, self.ignore_map,
+                self.pass_map,
+            )
+
+    def update(self, result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map):
+        """
+        Merges test details into the accumulator, takes the same arguments as sql_utils.update_test_details().
+        A test only ever sets its own result and map bit, so merging the copy it got from get() is safe while
+        other tests run concurrently.
+        """
+        with self._lock:
+            for test_id, message in enumerate(result):
+                if message != '':
+                    self.result[test_id] = message
+            self.fail, self.ignore, self.warn = fail, ignore, warn
+            self.fail_map |= fail_map
+            self.warn_map |= warn_map
+            self.ignore_map |= ignore_map
+            self.pass_map |= pass_map
+            if self.write_through:
+                self._write()
+
+    def flush(self):
+        """
+        Writes the accumulated test details to installer.db in a single transaction
+        """
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        update_test_details(
+            self.result, self.fail, self.ignore, self.warn, self.fail_map, self.warn_map, self.ignore_map,
+            self.pass_map,
+        )
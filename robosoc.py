@@ -1,15 +1,66 @@
 #!/usr/bin/env python3
 # stdlib
+import gzip
+import json
+import mmap
 import os
+import random
 import shutil
-from datetime import datetime
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.client import HTTPException
 from string import Template
 # lib
 import ipaddress
-from urllib.error import HTTPError
-from urllib.request import urlretrieve
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
 # local
 
+# Elements per nft add/delete element statement in a batch script
+NFT_CHUNK_SIZE = 1000
+# Seconds to wait on the ipblocklist server
+DOWNLOAD_TIMEOUT = 60
+# Format of the Published datetime in the ipblocklist header
+PUBLISH_DATETIME_FORMAT = '%H:%M:%S %d/%m/%y'
+
+# Snapshot of a parsed and collapsed ipblocklist, saved next to the text file it was parsed from:
+# header of magic, format version, ipv4 count, ipv6 count and the size and mtime of the text file,
+# then the ipv4 records (network, prefixlen) followed by the ipv6 records (network high, network low, prefixlen)
+SNAPSHOT_MAGIC = b'RSOC'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sHxxQQQq')
+SNAPSHOT_IPV4 = struct.Struct('>IB')
+SNAPSHOT_IPV6 = struct.Struct('>QQB')
+
+# Daemon mode defaults, in seconds
+DAEMON_INTERVAL = 900
+DAEMON_JITTER = 120
+DAEMON_RETRY = 60
+DAEMON_MAX_BACKOFF = 3600
+DAEMON_STATUS_FILE = '/etc/cloudcix/robosoc/status.json'
+
+# Metrics of the last run for the node exporter textfile collector and a json line per run
+METRICS_FILE = '/var/lib/prometheus/node-exporter/robosoc.prom'
+RUN_LOG_FILE = '/etc/cloudcix/robosoc/runs.log'
+# Size in bytes the run log may reach before it is moved to runs.log.1, replacing the one before
+RUN_LOG_MAX_BYTES = 1024 * 1024
+
+# Collapsed networks of the active ipblocklist kept in memory between runs of a long running process,
+# keyed by the path of the active file with the size and mtime of the file they were parsed from
+_resident_active = {}
+
+
+class RoboSOCUpdateError(Exception):
+    """Raise when the RoboSOC blocklist could not be downloaded or loaded to nftables"""
+
 
 template_robosoc = Template("""
 table inet RoboSOC_Blocklist {
@@ -52,70 +103,150 @@ table inet RoboSOC_Blocklist {
 """)
 
 
-def download_ipblocklist(filename, path, url):
+def read_download_meta(meta_file_path):
     """
-    Downloads file from the given url to the given path
-    :param filename: name of the file to be downloaded
-    :param path: location of the file to be placed
-    :param url: website link to download file
-    :return: boolean: downloaded status
+    Reads the ETag and Last-Modified headers saved with an ipblocklist
+    :param meta_file_path: location of the meta file
+    :return: dictionary with etag and last_modified, empty if there is no meta file
     """
     try:
-        urlretrieve(url, f'{path}candidate_{filename}.txt')
-        return True
-    except HTTPError:
-        return False
+        with open(meta_file_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
 
 
-def get_publish_datetime(file_path):
+def parse_publish_datetime(line):
+    """
+    :param line: string: an ipblocklist header line e.g. '# Published @ 10:00:00 01/02/24'
+    :return: datetime: the Published datetime or None if the line has none
+    """
+    if 'Published' not in line or '@' not in line:
+        return None
+    try:
+        return datetime.strptime(line.split('@')[1].strip(), PUBLISH_DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def read_publish_datetime(file_path):
     """
-    Finds out the Published datetime from the ipblocklist text file
     :param file_path: string: given ipblocklist file path
-    :return publish_datetime: string: Published datetime
+    :return: datetime: the Published datetime of the ipblocklist or None if it has none
     """
-    publish_datetime = '00:00:00 01/01/2023'
     with open(file_path, 'r') as file:
-        lines = file.readlines()
-    for line in lines:
-        if 'Published' in line:
-            publish_datetime = line.split('@')[1].strip()
-    return publish_datetime
+        for line in file:
+            publish_datetime = parse_publish_datetime(line)
+            if publish_datetime is not None:
+                return publish_datetime
+    return None
+
+
+def download_ipblocklist(filename, path, url):
+    """
+    Downloads file from the given url to the given path.
+    The ETag and Last-Modified of the active ipblocklist are sent so the server can answer 304 Not Modified,
+    gzip transfer encoding is accepted and the body is streamed to disk. The download is abandoned as soon as the
+    Published header shows the list is not newer than the active ipblocklist.
+    A body cut short of its Content-Length, or a truncated gzip stream, counts as a failed download.
+    :param filename: name of the file to be downloaded
+    :param path: location of the file to be placed
+    :param url: website link to download file
+    :return: boolean: downloaded status, False when the ipblocklist is unchanged, None when the download failed
+    """
+    candidate_file_path = f'{path}candidate_{filename}.txt'
+    active_file_path = f'{path}active_{filename}.txt'
+    active_publish_datetime = None
+    headers = {'Accept-Encoding': 'gzip'}
+    if os.path.exists(active_file_path):
+        active_publish_datetime = read_publish_datetime(active_file_path)
+        meta = read_download_meta(f'{path}active_{filename}.meta.json')
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    try:
+        response = urlopen(Request(url, headers=headers), timeout=DOWNLOAD_TIMEOUT)
+    except HTTPError as error:
+        if error.code == 304:
+            # Not Modified
+            return False
+        return None
+    except (URLError, OSError):
+        return None
+
+    with response:
+        body = response
+        if response.headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.GzipFile(fileobj=response)
+        complete = True
+        failed = False
+        written = 0
+        try:
+            with open(candidate_file_path, 'wb') as file:
+                for line in body:
+                    if active_publish_datetime is not None and b'Published' in line:
+                        publish_datetime = parse_publish_datetime(line.decode(errors='replace'))
+                        if publish_datetime is not None and publish_datetime <= active_publish_datetime:
+                            # Unchanged, the rest of the list is not downloaded
+                            complete = False
+                            break
+                    file.write(line)
+                    written += len(line)
+        except (OSError, EOFError, HTTPException):
+            # A truncated gzip body raises EOFError
+            complete = False
+            failed = True
+        content_length = response.headers.get('Content-Length', '')
+        if complete and body is response and content_length.isdigit() and written != int(content_length):
+            # The connection closed early, iterating the body just stops so the length has to be checked
+            complete = False
+            failed = True
+        if not complete:
+            os.remove(candidate_file_path)
+            return None if failed else False
+
+    with open(f'{path}candidate_{filename}.meta.json', 'w') as file:
+        json.dump({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }, file)
+    return True
 
 
 def check_to_process_blocklist(candidate_file_path, active_file_path):
     """
     Collects the Publish datetime from both candidate and active files and compares.
-    If candidate publish datetime is greater than active then sets process to True
+    If candidate publish datetime is greater than active then sets process to True.
+    A candidate without a Published datetime is never processed, an active file without one is always replaced
     :param candidate_file_path: string: Candidate ipblocklist txt file path
     :param active_file_path: string: Active ipblocklist txt file path
     :return process: boolean: flag to continue the processing blocklist.
     """
-    candidate_publish_datetime = get_publish_datetime(candidate_file_path)
-    active_publish_datetime = get_publish_datetime(active_file_path)
-
-    # Convert the strings to datetime objects
-    candidate_publish_datetime_object = datetime.strptime(candidate_publish_datetime, '%H:%M:%S %d/%m/%y')
-    active_publish_datetime_object = datetime.strptime(active_publish_datetime, '%H:%M:%S %d/%m/%y')
-
-    # Compare the datetime objects
-    process = False
-    if candidate_publish_datetime_object > active_publish_datetime_object:
-        process = True
-
-    return process
+    candidate_publish_datetime = read_publish_datetime(candidate_file_path)
+    if candidate_publish_datetime is None:
+        return False
+    active_publish_datetime = read_publish_datetime(active_file_path)
+    if active_publish_datetime is None:
+        return True
+    return candidate_publish_datetime > active_publish_datetime
 
 
-def direct_load_robosoc_nft(ipv4s, ipv6s):
+def direct_load_robosoc_nft(ipv4s, ipv6s, restart=False):
     """
     Generates /etc/nftables.d/robosoc.conf from above defined template_robosoc template
-    with all the ipv4 and ipv6 RoboSOC blocklist.
-    :param ipv4s: 'list of ipv4 addresses'
-    :param ipv6s: 'list of ipv6 addresses'
-    :return: None
+    with all the ipv4 and ipv6 RoboSOC blocklist and loads it.
+    By default only the RoboSOC_Blocklist table is replaced, in one nft transaction, so the rest of the firewall
+    and its connection state are not touched.
+    :param ipv4s: 'list of ipv4 (network, prefixlen) tuples'
+    :param ipv6s: 'list of ipv6 (network, prefixlen) tuples'
+    :param restart: restart the nftables service to load the file instead
+    :return: boolean: loaded status
     """
     # load the robosoc.j2 template and update with ipaddresses
-    element_ipv4s = '{' + ', '.join(ipv4s) + '}'
-    element_ipv6s = '{' + ', '.join(ipv6s) + '}'
+    element_ipv4s = '{' + ', '.join(format_networks(ipv4s, 4)) + '}'
+    element_ipv6s = '{' + ', '.join(format_networks(ipv6s, 6)) + '}'
     robosoc_template = template_robosoc.substitute({
         'element_ipv4s': element_ipv4s,
         'element_ipv6s': element_ipv6s,
@@ -124,93 +255,461 @@ def direct_load_robosoc_nft(ipv4s, ipv6s):
     with open(f'/etc/nftables.d/robosoc.conf', 'w') as file:
         file.write(robosoc_template)
 
-    # Restart the nftables
-    os.system('sudo systemctl restart nftables')
+    if restart:
+        # Restart the nftables
+        return os.system('sudo systemctl restart nftables') == 0
+    return load_robosoc_table('/etc/nftables.d/robosoc.conf', '/etc/cloudcix/robosoc/robosoc_load.nft')
+
+
+def load_robosoc_table(conf_file_path, batch_file_path):
+    """
+    Replaces the RoboSOC_Blocklist table with the one defined in conf_file_path. The table is created if it
+    does not exist so it can always be deleted, then deleted and defined again, all in one nft transaction.
+    :param conf_file_path: location of the RoboSOC_Blocklist table definition
+    :param batch_file_path: location of the nft script to write
+    :return: boolean: loaded status
+    """
+    with open(batch_file_path, 'w') as file:
+        file.write('add table inet RoboSOC_Blocklist\n')
+        file.write('delete table inet RoboSOC_Blocklist\n')
+        file.write(f'include "{conf_file_path}"\n')
+    return apply_nft_batch(batch_file_path)
+
+
+def parse_network(line):
+    """
+    Parses an ipaddress or network into its integer form, host bits are cleared as with
+    ipaddress.ip_network(line, strict=False)
+    :param line: string: e.g. '1.1.1.1', '2.4.5.6/30' or '2001:db8::/32'
+    :return: tuple: (version, network, prefixlen) e.g. (4, 33686016, 30), None if the line is not an ipaddress
+    """
+    address, _, prefix = line.partition('/')
+    if ':' in address:
+        family, version, bits = socket.AF_INET6, 6, 128
+    else:
+        family, version, bits = socket.AF_INET, 4, 32
+    try:
+        network = int.from_bytes(socket.inet_pton(family, address), 'big')
+    except OSError:
+        return None
+
+    if prefix == '':
+        prefixlen = bits
+    elif prefix.isdigit() and int(prefix) <= bits:
+        prefixlen = int(prefix)
+    else:
+        # Uncommon forms such as a netmask prefix are left to ipaddress
+        try:
+            parsed = ipaddress.ip_network(line, strict=False)
+        except ValueError:
+            return None
+        return parsed.version, int(parsed.network_address), parsed.prefixlen
+
+    return version, network >> (bits - prefixlen) << (bits - prefixlen), prefixlen
+
+
+def format_network(version, network, prefixlen):
+    """
+    Formats an integer network from parse_network() for nftables
+    :param version: type 4 or 6 of IPaddress
+    :param network: integer network address
+    :param prefixlen: prefix length of the network
+    :return: string: e.g. '2.4.5.4/30'
+    """
+    if version == 4:
+        return f'{socket.inet_ntop(socket.AF_INET, network.to_bytes(4, "big"))}/{prefixlen}'
+    return f'{socket.inet_ntop(socket.AF_INET6, network.to_bytes(16, "big"))}/{prefixlen}'
+
+
+def iter_ipblocklist(file_path):
+    """
+    Streams IPaddresses from a file at given file_path one line at a time, comments, blank lines
+    and lines that are not ipaddresses are skipped
+    :param file_path: location of the file to read ipaddresses
+    :return: generator of (version, network, prefixlen) tuples from parse_network()
+    """
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if '#' in line or line == '':
+                continue
+            parsed = parse_network(line)
+            if parsed is not None:
+                yield parsed
 
 
 def read_ipblocklist(file_path):
     """
     Reads IPaddresses from a file at given file_path
     :param file_path: location of the file to read ipaddresses
-    :return: tuple of sets of ipv4 and ipv6 addresses
+    :return: tuple of sets of ipv4 and ipv6 (network, prefixlen) tuples
     """
-    ipv4s = []
-    ipv6s = []
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-    for line in lines:
-        line = line.strip()
-        if '#' not in line and line != '':
-            if ':' not in line:
-                try:
-                    ip4 = str(ipaddress.ip_network(line, strict=False))
-                    ipv4s.append(ip4)
-                except ValueError:
-                    pass
-            if ':' in line:
-                try:
-                    ip6 = str(ipaddress.ip_network(line, strict=False))
-                    ipv6s.append(ip6)
-                except ValueError:
-                    pass
-    return set(ipv4s), set(ipv6s)
+    ipv4s = set()
+    ipv6s = set()
+    for version, network, prefixlen in iter_ipblocklist(file_path):
+        if version == 4:
+            ipv4s.add((network, prefixlen))
+        else:
+            ipv6s.add((network, prefixlen))
+    return ipv4s, ipv6s
 
 
-def compare_ipblocklist(candidate_file_path, active_file_path):
+def collapse_networks(networks, version):
     """
-    1. Finds ipv4s and ipv6s from the given files (candidate and active)
-    2. Finds the differences between candidate and active sets
-    3. Finds the removed ones and added ones for ipv4 and ipv6
-    4. Returns a dictionary of removed and added ipv4s and ipv6s respectively.
-    :param candidate_file_path: string: path to candidate ipblocklist
+    Collapses networks into the fewest networks covering the same addresses, the same result as
+    ipaddress.collapse_addresses() but worked on integer ranges. Overlapping and adjacent networks are merged
+    in a single pass over the sorted ranges and each merged range is split back into networks.
+    :param networks: iterable of (network, prefixlen) tuples from read_ipblocklist()
+    :param version: type 4 or 6 of IPaddress
+    :return: list of (network, prefixlen) tuples in address order
+    """
+    bits = 32 if version == 4 else 128
+    ranges = sorted((network, network + (1 << (bits - prefixlen)) - 1) for network, prefixlen in networks)
+
+    merged = []
+    for first, last in ranges:
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1][1] = last
+        else:
+            merged.append([first, last])
+
+    collapsed = []
+    for first, last in merged:
+        while first <= last:
+            # The largest network that starts at first and does not go past last
+            size = (first & -first).bit_length() - 1 if first else bits
+            size = min(size, (last - first + 1).bit_length() - 1)
+            collapsed.append((first, bits - size))
+            first += 1 << size
+    return collapsed
+
+
+def aggregate_ipblocklist(ipv4s, ipv6s):
+    """
+    Collapses the ipv4 and ipv6 networks of a blocklist before they are loaded to nftables
+    :param ipv4s: set of ipv4 (network, prefixlen) tuples
+    :param ipv6s: set of ipv6 (network, prefixlen) tuples
+    :return: tuple of lists of collapsed ipv4 and ipv6 networks in address order and a dictionary of element
+             counts before and after
+    """
+    collapsed_ipv4s = collapse_networks(ipv4s, 4)
+    collapsed_ipv6s = collapse_networks(ipv6s, 6)
+    stats = {
+        'ipv4s_read': len(ipv4s),
+        'ipv4s_loaded': len(collapsed_ipv4s),
+        'ipv4s_saved': len(ipv4s) - len(collapsed_ipv4s),
+        'ipv6s_read': len(ipv6s),
+        'ipv6s_loaded': len(collapsed_ipv6s),
+        'ipv6s_saved': len(ipv6s) - len(collapsed_ipv6s),
+    }
+    return collapsed_ipv4s, collapsed_ipv6s, stats
+
+
+def diff_networks(candidate, active):
+    """
+    Merge-diffs two lists of networks sorted in address order in a single pass
+    :param candidate: sorted list of (network, prefixlen) tuples from the newly downloaded ipblocklist
+    :param active: sorted list of (network, prefixlen) tuples from the active ipblocklist
+    :return: tuple of sorted lists of the removed (only in active) and added (only in candidate) networks
+    """
+    removed = []
+    added = []
+    i = j = 0
+    while i < len(candidate) and j < len(active):
+        if candidate[i] == active[j]:
+            i += 1
+            j += 1
+        elif candidate[i] < active[j]:
+            added.append(candidate[i])
+            i += 1
+        else:
+            removed.append(active[j])
+            j += 1
+    added.extend(candidate[i:])
+    removed.extend(active[j:])
+    return removed, added
+
+
+def write_snapshot(snapshot_file_path, source_file_path, ipv4s, ipv6s):
+    """
+    Saves parsed and collapsed networks so the next run does not parse source_file_path again
+    :param snapshot_file_path: location of the snapshot to write
+    :param source_file_path: location of the ipblocklist text file the networks were read from
+    :param ipv4s: sorted list of ipv4 (network, prefixlen) tuples
+    :param ipv6s: sorted list of ipv6 (network, prefixlen) tuples
+    :return: None
+    """
+    source = os.stat(source_file_path)
+    with open(f'{snapshot_file_path}.tmp', 'wb') as file:
+        file.write(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(ipv4s), len(ipv6s), source.st_size, source.st_mtime_ns,
+        ))
+        file.write(b''.join(SNAPSHOT_IPV4.pack(network, prefixlen) for network, prefixlen in ipv4s))
+        file.write(b''.join(
+            SNAPSHOT_IPV6.pack(network >> 64, network & 0xffffffffffffffff, prefixlen) for network, prefixlen in ipv6s
+        ))
+    os.replace(f'{snapshot_file_path}.tmp', snapshot_file_path)
+
+
+def read_snapshot(snapshot_file_path, source_file_path):
+    """
+    Reads networks saved by write_snapshot() through a memory map
+    :param snapshot_file_path: location of the snapshot
+    :param source_file_path: location of the ipblocklist text file the snapshot must have been made from
+    :return: tuple of sorted lists of ipv4 and ipv6 (network, prefixlen) tuples, None if there is no snapshot
+             or it does not match source_file_path
+    """
+    try:
+        source = os.stat(source_file_path)
+        with open(snapshot_file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, ipv4_count, ipv6_count, size, mtime_ns = SNAPSHOT_HEADER.unpack_from(data)
+            ipv4_end = SNAPSHOT_HEADER.size + ipv4_count * SNAPSHOT_IPV4.size
+            ipv6_end = ipv4_end + ipv6_count * SNAPSHOT_IPV6.size
+            if (
+                magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or len(data) != ipv6_end
+                or size != source.st_size or mtime_ns != source.st_mtime_ns
+            ):
+                return None
+            with memoryview(data) as view:
+                ipv4s = list(SNAPSHOT_IPV4.iter_unpack(view[SNAPSHOT_HEADER.size:ipv4_end]))
+                ipv6s = [
+                    ((high << 64) | low, prefixlen)
+                    for high, low, prefixlen in SNAPSHOT_IPV6.iter_unpack(view[ipv4_end:ipv6_end])
+                ]
+    except (OSError, ValueError, struct.error):
+        return None
+    return ipv4s, ipv6s
+
+
+def read_active_networks(active_file_path, active_snapshot_file_path=None):
+    """
+    Finds the collapsed networks of the active ipblocklist, from memory if they are resident, else from the
+    snapshot if it is valid, else by parsing the active ipblocklist
     :param active_file_path: string: path to active ipblocklist
-    :return: dictionary with removed and added ipv4s and ipv6s
+    :param active_snapshot_file_path: string: path to the snapshot of the active ipblocklist
+    :return: tuple of sorted lists of ipv4 and ipv6 (network, prefixlen) tuples
     """
-    candidate_ipv4s, candidate_ipv6s = read_ipblocklist(candidate_file_path)
-    active_ipv4s, active_ipv6s = read_ipblocklist(active_file_path)
+    active = get_resident_active(active_file_path)
+    if active is None and active_snapshot_file_path is not None:
+        active = read_snapshot(active_snapshot_file_path, active_file_path)
+    if active is None:
+        active = aggregate_ipblocklist(*read_ipblocklist(active_file_path))[:2]
+    return active
 
-    # Find the difference(the ones that are not common in two sets)
-    difference_ipv4s = candidate_ipv4s ^ active_ipv4s
-    difference_ipv6s = candidate_ipv6s ^ active_ipv6s
 
-    # Find the removed (the ones that are only in difference and not in candidate)
-    removed_ipv4s = difference_ipv4s - candidate_ipv4s
-    removed_ipv6s = difference_ipv6s - candidate_ipv6s
+def get_resident_active(active_file_path):
+    """
+    :param active_file_path: string: path to active ipblocklist
+    :return: tuple of the ipv4 and ipv6 networks kept in memory for the active ipblocklist, None if there are none
+             or the file has changed since
+    """
+    resident = _resident_active.get(active_file_path)
+    if resident is None:
+        return None
+    try:
+        source = os.stat(active_file_path)
+    except OSError:
+        return None
+    if resident[:2] != (source.st_size, source.st_mtime_ns):
+        return None
+    return resident[2], resident[3]
 
-    # Find the added (the ones that are only in difference and not in active)
-    added_ipv4s = difference_ipv4s - active_ipv4s
-    added_ipv6s = difference_ipv6s - active_ipv6s
+
+def set_resident_active(active_file_path, ipv4s, ipv6s):
+    """
+    Keeps the networks of the active ipblocklist in memory for the next run of a long running process
+    :param active_file_path: string: path to active ipblocklist
+    :param ipv4s: sorted list of ipv4 (network, prefixlen) tuples
+    :param ipv6s: sorted list of ipv6 (network, prefixlen) tuples
+    :return: None
+    """
+    source = os.stat(active_file_path)
+    _resident_active.clear()
+    _resident_active[active_file_path] = (source.st_size, source.st_mtime_ns, ipv4s, ipv6s)
+
+
+def format_networks(networks, version):
+    """
+    :param networks: iterable of (network, prefixlen) tuples from read_ipblocklist()
+    :param version: type 4 or 6 of IPaddress
+    :return: list of networks formatted for nftables
+    """
+    return [format_network(version, network, prefixlen) for network, prefixlen in networks]
+
+
+def compare_ipblocklist(candidate_file_path, active_file_path, active_snapshot_file_path=None, metrics=None):
+    """
+    1. Finds ipv4s and ipv6s from the given files (candidate and active)
+    2. Merge-diffs the sorted candidate and active networks for ipv4 and ipv6
+    3. Returns a dictionary of removed and added ipv4s and ipv6s respectively, each a sorted list of
+       (network, prefixlen) tuples.
+    Both lists are collapsed first so the differences are between the sets as loaded in nftables.
+    The active networks are read from the snapshot of the active ipblocklist when there is a valid one.
+    :param candidate_file_path: string: path to candidate ipblocklist
+    :param active_file_path: string: path to active ipblocklist
+    :param active_snapshot_file_path: string: path to the snapshot of the active ipblocklist
+    :param metrics: dictionary the seconds taken to parse and diff are recorded in
+    :return: dictionary with removed and added ipv4s and ipv6s, the collapsed candidate ipv4s and ipv6s and the
+             stats of the candidate aggregation
+    """
+    with timed(metrics, 'parse'):
+        candidate_ipv4s, candidate_ipv6s, stats = aggregate_ipblocklist(*read_ipblocklist(candidate_file_path))
+        active_ipv4s, active_ipv6s = read_active_networks(active_file_path, active_snapshot_file_path)
+
+    # Removed are only in active, added are only in candidate
+    with timed(metrics, 'diff'):
+        removed_ipv4s, added_ipv4s = diff_networks(candidate_ipv4s, active_ipv4s)
+        removed_ipv6s, added_ipv6s = diff_networks(candidate_ipv6s, active_ipv6s)
 
     return {
-        'removed_ipv4s': '{' + ', '.join(removed_ipv4s) + '}' if len(removed_ipv4s) > 0 else '',
-        'removed_ipv6s': '{' + ', '.join(removed_ipv6s) + '}' if len(removed_ipv6s) > 0 else '',
-        'added_ipv4s': '{' + ', '.join(added_ipv4s) + '}' if len(added_ipv4s) > 0 else '',
-        'added_ipv6s': '{' + ', '.join(added_ipv6s) + '}' if len(added_ipv6s) > 0 else '',
+        'removed_ipv4s': removed_ipv4s,
+        'removed_ipv6s': removed_ipv6s,
+        'added_ipv4s': added_ipv4s,
+        'added_ipv6s': added_ipv6s,
+        'candidate_ipv4s': candidate_ipv4s,
+        'candidate_ipv6s': candidate_ipv6s,
+        'stats': stats,
     }
 
 
-def apply_add_ips(element, version):
+def render_element_statements(command, networks, version):
     """
-    Adds element to the concerned Chain of RoboSOC_Blocklist nftable
-    :param element: A string of set of ipaddresses e.g "{'1.1.1.1/32', '2.4.5.6/30'}"
+    Renders nft element statements for the concerned set of RoboSOC_Blocklist nftable, NFT_CHUNK_SIZE
+    elements per statement so no single line grows with the size of the blocklist
+    :param command: 'add' or 'delete'
+    :param networks: list of (network, prefixlen) tuples
     :param version: type 4 or 6 of IPaddress
-    :return: None
+    :return: generator of statement lines
+    """
+    for start in range(0, len(networks), NFT_CHUNK_SIZE):
+        elements = ', '.join(format_networks(networks[start:start + NFT_CHUNK_SIZE], version))
+        yield f'{command} element inet RoboSOC_Blocklist RoboSOC_ipv{version} {{ {elements} }}\n'
+
+
+def write_nft_batch(processed_ips, batch_file_path):
+    """
+    Writes the changes from compare_ipblocklist() as an nft script, removed ipaddresses are deleted before the added
+    ones are added
+    :param processed_ips: dictionary with removed and added ipv4s and ipv6s
+    :param batch_file_path: location of the nft script to write
+    :return: int: number of statements written
     """
-    if len(element):
-        cmd = f'sudo nft add element inet RoboSOC_Blocklist RoboSOC_ipv{version} {element}'
-        os.system(cmd)
+    statements = 0
+    with open(batch_file_path, 'w') as file:
+        for command, key, version in (
+            ('delete', 'removed_ipv4s', 4),
+            ('delete', 'removed_ipv6s', 6),
+            ('add', 'added_ipv4s', 4),
+            ('add', 'added_ipv6s', 6),
+        ):
+            for statement in render_element_statements(command, processed_ips[key], version):
+                file.write(statement)
+                statements += 1
+    return statements
 
 
-def apply_remove_ips(element, version):
+def apply_nft_batch(batch_file_path):
     """
-    Deletes element to the concerned Chain of RoboSOC_Blocklist nftable
-    :param element: A string of set of ipaddresses e.g "{'1.1.1.1/32', '2.4.5.6/30'}"
+    Applies an nft script with `nft -f`, nftables applies the whole script as one transaction so either every
+    change is made or none are
+    :param batch_file_path: location of the nft script
+    :return: boolean: applied status
+    """
+    return subprocess.run(['sudo', 'nft', '-f', batch_file_path]).returncode == 0
+
+
+def parse_nft_set_elements(elements, version):
+    """
+    Parses the elements of a set from `nft -j list set` output
+    :param elements: list of elements, each an address string, a {'prefix': {'addr', 'len'}} dictionary or either
+                     wrapped in {'elem': {'val': ...}}
     :param version: type 4 or 6 of IPaddress
-    :return: None
+    :return: sorted list of (network, prefixlen) tuples, None if the set holds an element that is not an address or
+             a prefix such as a range
+    """
+    networks = []
+    for element in elements:
+        if isinstance(element, dict) and 'elem' in element:
+            element = element['elem'].get('val')
+        if isinstance(element, str):
+            parsed = parse_network(element)
+        elif isinstance(element, dict) and 'prefix' in element:
+            parsed = parse_network(f'{element["prefix"]["addr"]}/{element["prefix"]["len"]}')
+        else:
+            return None
+        if parsed is None or parsed[0] != version:
+            return None
+        networks.append(parsed[1:])
+    return sorted(networks)
+
+
+def list_nft_set(version):
+    """
+    Lists the elements loaded in the concerned set of RoboSOC_Blocklist nftable
+    :param version: type 4 or 6 of IPaddress
+    :return: sorted list of (network, prefixlen) tuples as loaded, None if the set could not be listed or parsed
+    """
+    result = subprocess.run(
+        ['sudo', 'nft', '-j', 'list', 'set', 'inet', 'RoboSOC_Blocklist', f'RoboSOC_ipv{version}'],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        output = json.loads(result.stdout)
+    except ValueError:
+        return None
+    for item in output.get('nftables', []):
+        if 'set' in item:
+            return parse_nft_set_elements(item['set'].get('elem', []), version)
+    return None
+
+
+def reconcile_robosoc_nft(filename='ipblocklist', path='/etc/cloudcix/robosoc/'):
     """
-    if len(element):
-        cmd = f'sudo nft delete element inet RoboSOC_Blocklist RoboSOC_ipv{version} {element}'
-        os.system(cmd)
+    Compares the RoboSOC_Blocklist sets loaded in nftables with the active ipblocklist and applies only the
+    elements that differ, in a single nft transaction. If the sets cannot be listed or hold elements other than
+    addresses and prefixes the whole table is loaded again instead.
+    :param filename: name of the ipblocklist
+    :param path: location of the ipblocklist files
+    :return: dictionary with the numbers of removed and added ipv4s and ipv6s, None if there is no active ipblocklist
+    :raises RoboSOCUpdateError: when the correction could not be applied
+    """
+    active_file_path = f'{path}active_{filename}.txt'
+    if not os.path.exists(active_file_path):
+        return None
+    desired_ipv4s, desired_ipv6s = read_active_networks(active_file_path, f'{path}active_{filename}.bin')
+    loaded_ipv4s = list_nft_set(4)
+    loaded_ipv6s = list_nft_set(6)
+
+    if loaded_ipv4s is None or loaded_ipv6s is None:
+        if not direct_load_robosoc_nft(desired_ipv4s, desired_ipv6s):
+            raise RoboSOCUpdateError('Failed to load the RoboSOC_Blocklist table')
+        update_robosoc_nft_file()
+        return {
+            'removed_ipv4s': 0,
+            'removed_ipv6s': 0,
+            'added_ipv4s': len(desired_ipv4s),
+            'added_ipv6s': len(desired_ipv6s),
+        }
+
+    # Removed are loaded but not desired, added are desired but not loaded
+    removed_ipv4s, added_ipv4s = diff_networks(desired_ipv4s, loaded_ipv4s)
+    removed_ipv6s, added_ipv6s = diff_networks(desired_ipv6s, loaded_ipv6s)
+    correction = {
+        'removed_ipv4s': removed_ipv4s,
+        'removed_ipv6s': removed_ipv6s,
+        'added_ipv4s': added_ipv4s,
+        'added_ipv6s': added_ipv6s,
+    }
+    batch_file_path = f'{path}robosoc_reconcile.nft'
+    if write_nft_batch(correction, batch_file_path) > 0:
+        if not apply_nft_batch(batch_file_path):
+            raise RoboSOCUpdateError('Failed to apply the RoboSOC_Blocklist correction')
+        update_robosoc_nft_file()
+    return {key: len(networks) for key, networks in correction.items()}
 
 
 def update_robosoc_nft_file():
@@ -218,7 +717,8 @@ def update_robosoc_nft_file():
     Replaces the robosoc.nft with updated ipblocklist to store the changes.
     :return: None
     """
-    os.system('sudo nft list table inet RoboSOC_Blocklist > /etc/cloudcix/robosoc/robosoc.nft')
+    with open('/etc/cloudcix/robosoc/robosoc.nft', 'w') as file:
+        subprocess.run(['sudo', 'nft', 'list', 'table', 'inet', 'RoboSOC_Blocklist'], stdout=file)
 
 
 def update_active_file(filename, path):
@@ -229,24 +729,77 @@ def update_active_file(filename, path):
     :return: None
     """
     shutil.move(f'{path}candidate_{filename}.txt', f'{path}active_{filename}.txt')
+    # The ETag and Last-Modified saved by download_ipblocklist() and the snapshot now describe the active file
+    for extension in ('meta.json', 'bin'):
+        if os.path.exists(f'{path}candidate_{filename}.{extension}'):
+            shutil.move(f'{path}candidate_{filename}.{extension}', f'{path}active_{filename}.{extension}')
+
+
+@contextmanager
+def timed(metrics, stage):
+    """
+    Records the seconds a block takes as metrics['stages'][stage]
+    :param metrics: dictionary of the run metrics, nothing is recorded if None
+    :param stage: name of the stage e.g. 'download'
+    """
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.setdefault('stages', {})[stage] = round(time.monotonic() - started, 6)
+
+
+def load_full_ipblocklist(candidate_file_path, restart_nftables=False, metrics=None):
+    """
+    Loads every network of the candidate ipblocklist, replacing the RoboSOC_Blocklist table
+    :param candidate_file_path: string: path to candidate ipblocklist
+    :param restart_nftables: load the blocklist by restarting the nftables service instead
+    :param metrics: dictionary the seconds taken to parse and apply are recorded in
+    :return: tuple of the collapsed ipv4s and ipv6s loaded and the stats of the aggregation
+    :raises RoboSOCUpdateError: when the table could not be loaded, the candidate file is removed
+    """
+    # supply the file and get the ipv4s and ipv6s
+    with timed(metrics, 'parse'):
+        all_ipv4s, all_ipv6s, stats = aggregate_ipblocklist(*read_ipblocklist(candidate_file_path))
+    # load directly into robosoc.nft file via robosoc.j2
+    with timed(metrics, 'apply'):
+        loaded = direct_load_robosoc_nft(all_ipv4s, all_ipv6s, restart_nftables)
+    if not loaded:
+        os.remove(candidate_file_path)
+        raise RoboSOCUpdateError('Failed to load the RoboSOC_Blocklist table')
+    return all_ipv4s, all_ipv6s, stats
 
 
-def process_robosoc_ipblocklist():
+def process_robosoc_ipblocklist(restart_nftables=False, metrics=None):
     """
     Processes RoboSOC blocklist:
-    1. For first time, all the ipaddresses in candidate_ipblocklist.txt are loaded to nftables
-    2. For not the first time, only the changes applied such as removing ipaddresses and adding ipaddresses.
+    1. For first time, all the ipaddresses in candidate_ipblocklist.txt are loaded to nftables, replacing only the
+       RoboSOC_Blocklist table unless restart_nftables is set
+    2. For not the first time, only the changes applied such as removing ipaddresses and adding ipaddresses,
+       in a single nft transaction. If the transaction fails the active file is kept and the loaded sets are
+       reconciled with it so the next run retries from a known state.
+       If the active ipblocklist has no snapshot it was loaded by an older robosoc.py, the table is replaced instead.
     3. Updates the changes applied to robosoc.nft file
-    4. Moves the downloaded candidate_ipblocklist.txt to active_ipblocklist.txt for comparing on next iterations.
-    :return: None
+    4. Moves the downloaded candidate_ipblocklist.txt to active_ipblocklist.txt, with a snapshot of its parsed
+       networks in active_ipblocklist.bin, for comparing on next iterations.
+    :param restart_nftables: clear and load the blocklist on first run by restarting the nftables service
+    :param metrics: dictionary the seconds taken by each stage and the numbers of added and removed elements are
+                    recorded in
+    :return: dictionary of element counts before and after aggregation, None if the ipblocklist is unchanged
+    :raises RoboSOCUpdateError: when the ipblocklist could not be downloaded or loaded to nftables
     """
     filename = 'ipblocklist'
     path = '/etc/cloudcix/robosoc/'
     url = f'https://www.cloudcix.com/{filename}.txt'
 
     # First download the ipblocklist from website
-    if not download_ipblocklist(filename, path, url):
-        return
+    with timed(metrics, 'download'):
+        downloaded = download_ipblocklist(filename, path, url)
+    if downloaded is None:
+        raise RoboSOCUpdateError(f'Failed to download {url}')
+    if not downloaded:
+        return None
 
     # For the first time loading entire ip blocklist directly ie when no active ipblocklist
     if not os.path.exists(f'{path}active_{filename}.txt'):
@@ -254,33 +807,291 @@ def process_robosoc_ipblocklist():
         robosoc_nft_path = f'{path}robosoc.nft'
         if os.path.exists(robosoc_nft_path):
             os.remove(robosoc_nft_path)
-        # Clear all robosoc ipblocklist from nftables
-        os.system('sudo systemctl restart nftables')
-        # supply the file and get the ipv4s and ipv6s
-        all_ipv4s, all_ipv6s = read_ipblocklist(f'{path}candidate_{filename}.txt')
-        # load directly into robosoc.nft file via robosoc.j2
-        direct_load_robosoc_nft(all_ipv4s, all_ipv6s)
+        if restart_nftables:
+            # Clear all robosoc ipblocklist from nftables
+            os.system('sudo systemctl restart nftables')
+        loaded_ipv4s, loaded_ipv6s, stats = load_full_ipblocklist(
+            f'{path}candidate_{filename}.txt', restart_nftables, metrics,
+        )
+        changes = {
+            'removed_ipv4s': 0, 'removed_ipv6s': 0, 'added_ipv4s': len(loaded_ipv4s), 'added_ipv6s': len(loaded_ipv6s),
+        }
 
     # Not the First time, then unload removed and load the added only
     else:
-        if check_to_process_blocklist(f'{path}candidate_{filename}.txt', f'{path}active_{filename}.txt'):
-            # supply candidate (newly downloaded) and active (already present)
-            processed_ips = compare_ipblocklist(f'{path}candidate_{filename}.txt', f'{path}active_{filename}.txt')
-            # apply removed and then added ips
-            apply_remove_ips(processed_ips['removed_ipv4s'], 4)
-            apply_remove_ips(processed_ips['removed_ipv6s'], 6)
-            apply_add_ips(processed_ips['added_ipv4s'], 4)
-            apply_add_ips(processed_ips['added_ipv6s'], 6)
-        else:
-            #  Active ipblocklist is in sync with Candidate ipblocklist, remove downloaded candidate file
+        if not check_to_process_blocklist(f'{path}candidate_{filename}.txt', f'{path}active_{filename}.txt'):
+            #  Active ipblocklist is in sync with Candidate ipblocklist, remove downloaded candidate file
             os.remove(f'{path}candidate_{filename}.txt')
-            return
+            return None
+
+        if not os.path.exists(f'{path}active_{filename}.bin'):
+            # The active ipblocklist was loaded by an older robosoc.py without a snapshot, its sets may hold
+            # uncollapsed elements that a diff of the collapsed networks would fail to delete, so replace the table
+            loaded_ipv4s, loaded_ipv6s, stats = load_full_ipblocklist(f'{path}candidate_{filename}.txt', False, metrics)
+            changes = {
+                'removed_ipv4s': 0,
+                'removed_ipv6s': 0,
+                'added_ipv4s': len(loaded_ipv4s),
+                'added_ipv6s': len(loaded_ipv6s),
+            }
+        else:
+            # supply candidate (newly downloaded) and active (already present)
+            processed_ips = compare_ipblocklist(
+                f'{path}candidate_{filename}.txt', f'{path}active_{filename}.txt', f'{path}active_{filename}.bin',
+                metrics,
+            )
+            stats = processed_ips['stats']
+            # apply removed and then added ips as one transaction
+            batch_file_path = f'{path}robosoc_update.nft'
+            with timed(metrics, 'apply'):
+                applied = write_nft_batch(processed_ips, batch_file_path) == 0 or apply_nft_batch(batch_file_path)
+            if not applied:
+                os.remove(f'{path}candidate_{filename}.txt')
+                # A rejected statement, e.g. a delete of an element that is not loaded, would fail every later run
+                # the same way, so bring the sets back in line with the active ipblocklist for the next run
+                try:
+                    reconcile_robosoc_nft(filename, path)
+                except RoboSOCUpdateError as error:
+                    raise RoboSOCUpdateError(f'Failed to apply the RoboSOC_Blocklist changes, {error}')
+                raise RoboSOCUpdateError('Failed to apply the RoboSOC_Blocklist changes, the sets were reconciled')
+            loaded_ipv4s, loaded_ipv6s = processed_ips['candidate_ipv4s'], processed_ips['candidate_ipv6s']
+            changes = {
+                key: len(processed_ips[key]) for key in ('removed_ipv4s', 'removed_ipv6s', 'added_ipv4s', 'added_ipv6s')
+            }
 
     # update robosoc.nft file and move downloaded candidate file to active ipblocklist.txt file
-    update_robosoc_nft_file()
+    with timed(metrics, 'snapshot'):
+        write_snapshot(
+            f'{path}candidate_{filename}.bin', f'{path}candidate_{filename}.txt', loaded_ipv4s, loaded_ipv6s,
+        )
+    with timed(metrics, 'dump'):
+        update_robosoc_nft_file()
     update_active_file(filename, path)
-    return
+    set_resident_active(f'{path}active_{filename}.txt', loaded_ipv4s, loaded_ipv6s)
+    if metrics is not None:
+        metrics['changes'] = changes
+    return stats
+
+
+def render_metrics(metrics):
+    """
+    Renders run metrics in the Prometheus text exposition format
+    :param metrics: dictionary of the run metrics from run_robosoc_update()
+    :return: string: the metrics file content
+    """
+    lines = [
+        '# HELP robosoc_last_run_timestamp_seconds Unix time the last RoboSOC run started.',
+        '# TYPE robosoc_last_run_timestamp_seconds gauge',
+        f'robosoc_last_run_timestamp_seconds {metrics["started"]}',
+        '# HELP robosoc_last_run_duration_seconds Seconds the last RoboSOC run took.',
+        '# TYPE robosoc_last_run_duration_seconds gauge',
+        f'robosoc_last_run_duration_seconds {metrics["duration"]}',
+        '# HELP robosoc_last_run_success 1 if the last RoboSOC run did not fail.',
+        '# TYPE robosoc_last_run_success gauge',
+        f'robosoc_last_run_success {0 if metrics["result"] == "failed" else 1}',
+        '# HELP robosoc_last_run_loaded 1 if the last RoboSOC run loaded a new blocklist.',
+        '# TYPE robosoc_last_run_loaded gauge',
+        f'robosoc_last_run_loaded {1 if metrics["result"] == "loaded" else 0}',
+        '# HELP robosoc_stage_seconds Seconds each stage of the last RoboSOC run took.',
+        '# TYPE robosoc_stage_seconds gauge',
+    ]
+    for stage, seconds in metrics.get('stages', {}).items():
+        lines.append(f'robosoc_stage_seconds{{stage="{stage}"}} {seconds}')
+    if metrics.get('stats') is not None:
+        lines.append('# HELP robosoc_elements Blocklist elements read and loaded after aggregation.')
+        lines.append('# TYPE robosoc_elements gauge')
+        for key, count in metrics['stats'].items():
+            # e.g. ipv4s_read
+            family, kind = key.split('s_', 1)
+            lines.append(f'robosoc_elements{{family="{family}",kind="{kind}"}} {count}')
+    if metrics.get('changes') is not None:
+        lines.append('# HELP robosoc_changes Blocklist elements removed and added by the last load.')
+        lines.append('# TYPE robosoc_changes gauge')
+        for key, count in metrics['changes'].items():
+            # e.g. added_ipv4s
+            change, family = key.split('_', 1)
+            lines.append(f'robosoc_changes{{family="{family[:-1]}",change="{change}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(metrics, metrics_file_path, run_log_path):
+    """
+    Writes the run metrics to the Prometheus textfile and appends them as a json line to the run log, a file
+    whose directory does not exist is skipped. A run log over RUN_LOG_MAX_BYTES is rotated first
+    :param metrics: dictionary of the run metrics from run_robosoc_update()
+    :param metrics_file_path: location of the Prometheus textfile, None to skip
+    :param run_log_path: location of the json run log, None to skip
+    :return: None
+    """
+    if metrics_file_path is not None and os.path.isdir(os.path.dirname(metrics_file_path)):
+        # The collector may read at any time so the file is replaced in one step
+        with open(f'{metrics_file_path}.tmp', 'w') as file:
+            file.write(render_metrics(metrics))
+        os.replace(f'{metrics_file_path}.tmp', metrics_file_path)
+    if run_log_path is not None and os.path.isdir(os.path.dirname(run_log_path)):
+        if os.path.exists(run_log_path) and os.path.getsize(run_log_path) >= RUN_LOG_MAX_BYTES:
+            os.replace(run_log_path, f'{run_log_path}.1')
+        with open(run_log_path, 'a') as file:
+            file.write(json.dumps(metrics) + '\n')
+
+
+def run_robosoc_update(restart_nftables=False, metrics_file_path=METRICS_FILE, run_log_path=RUN_LOG_FILE):
+    """
+    Runs process_robosoc_ipblocklist() and writes the metrics of the run, whether it succeeds or fails
+    :param restart_nftables: clear and load the blocklist on first run by restarting the nftables service
+    :param metrics_file_path: location of the Prometheus textfile, None to skip
+    :param run_log_path: location of the json run log, None to skip
+    :return: dictionary of element counts before and after aggregation, None if the ipblocklist is unchanged
+    :raises RoboSOCUpdateError: when the ipblocklist could not be downloaded or loaded to nftables
+    """
+    metrics = {'started': round(time.time(), 3), 'result': 'failed', 'error': None, 'stats': None}
+    started = time.monotonic()
+    try:
+        stats = process_robosoc_ipblocklist(restart_nftables, metrics)
+    except Exception as error:
+        metrics['error'] = str(error)
+        raise
+    else:
+        metrics['result'] = 'unchanged' if stats is None else 'loaded'
+        metrics['stats'] = stats
+    finally:
+        metrics['duration'] = round(time.monotonic() - started, 6)
+        try:
+            write_metrics(metrics, metrics_file_path, run_log_path)
+        except OSError:
+            pass
+    return stats
+
+
+def write_status(status_file_path, status):
+    """
+    Writes the daemon status as json, replacing the file in one step so readers never see a partial file
+    :param status_file_path: location of the status file
+    :param status: dictionary of the daemon status
+    :return: None
+    """
+    with open(f'{status_file_path}.tmp', 'w') as file:
+        json.dump(status, file, indent=2)
+    os.replace(f'{status_file_path}.tmp', status_file_path)
+
+
+def next_delay(failures, interval, jitter, retry, max_backoff):
+    """
+    :param failures: number of runs in a row that have failed
+    :param interval: seconds between runs
+    :param jitter: up to this many random seconds are added to each wait so pods do not all poll at once
+    :param retry: seconds to wait after the first failure, doubled on each failure after
+    :param max_backoff: the most seconds to wait after a failure
+    :return: seconds to wait before the next run
+    """
+    if failures == 0:
+        delay = interval
+    else:
+        delay = min(retry * 2 ** (failures - 1), max_backoff)
+    return delay + random.uniform(0, jitter)
+
+
+def run_daemon(interval=DAEMON_INTERVAL, jitter=DAEMON_JITTER, retry=DAEMON_RETRY, max_backoff=DAEMON_MAX_BACKOFF,
+               status_file_path=DAEMON_STATUS_FILE, stop=None, metrics_file_path=METRICS_FILE,
+               run_log_path=RUN_LOG_FILE):
+    """
+    Runs process_robosoc_ipblocklist() until stopped, for use as a systemd service in place of the cron job.
+    The parsed active ipblocklist stays in memory between runs and each run is recorded in the status file.
+    :param interval: seconds between runs
+    :param jitter: up to this many random seconds are added to each wait, including before the first run
+    :param retry: seconds to wait after the first failure, doubled on each failure after
+    :param max_backoff: the most seconds to wait after a failure
+    :param status_file_path: location of the status file
+    :param stop: threading.Event that ends the daemon when set, a new one is made if not given
+    :param metrics_file_path: location of the Prometheus textfile, None to skip
+    :param run_log_path: location of the json run log, None to skip
+    :return: None
+    """
+    if stop is None:
+        stop = threading.Event()
+    status = {
+        'last_run': None,
+        'last_run_seconds': None,
+        'last_result': None,
+        'last_error': None,
+        'last_stats': None,
+        'consecutive_failures': 0,
+        'next_run': None,
+    }
+    delay = random.uniform(0, jitter)
+    while not stop.wait(delay):
+        started = time.monotonic()
+        status['last_run'] = datetime.now(timezone.utc).isoformat()
+        try:
+            stats = run_robosoc_update(metrics_file_path=metrics_file_path, run_log_path=run_log_path)
+        except Exception as error:
+            # Any failure is recorded and retried with backoff rather than ending the daemon
+            status['consecutive_failures'] += 1
+            status['last_result'] = 'failed'
+            status['last_error'] = str(error)
+        else:
+            status['consecutive_failures'] = 0
+            status['last_error'] = None
+            status['last_result'] = 'unchanged' if stats is None else 'loaded'
+            if stats is not None:
+                status['last_stats'] = stats
+        status['last_run_seconds'] = round(time.monotonic() - started, 3)
+
+        delay = next_delay(status['consecutive_failures'], interval, jitter, retry, max_backoff)
+        status['next_run'] = datetime.fromtimestamp(time.time() + delay, timezone.utc).isoformat()
+        try:
+            write_status(status_file_path, status)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Loads the RoboSOC blocklist into nftables')
+    parser.add_argument('--daemon', action='store_true', help='keep running and update on an interval')
+    parser.add_argument(
+        '--reconcile',
+        action='store_true',
+        help='repair the nftables sets to match the active blocklist instead of updating it',
+    )
+    parser.add_argument('--interval', type=float, default=DAEMON_INTERVAL, help='seconds between updates')
+    parser.add_argument('--jitter', type=float, default=DAEMON_JITTER, help='random seconds added to each wait')
+    parser.add_argument('--retry', type=float, default=DAEMON_RETRY, help='seconds to wait after a failure')
+    parser.add_argument('--max-backoff', type=float, default=DAEMON_MAX_BACKOFF, help='longest wait after failures')
+    parser.add_argument('--status-file', default=DAEMON_STATUS_FILE, help='where the daemon records each run')
+    parser.add_argument('--metrics-file', default=METRICS_FILE, help='Prometheus textfile for the run metrics')
+    parser.add_argument('--run-log', default=RUN_LOG_FILE, help='file a json line is appended to for each run')
+    args = parser.parse_args(argv)
+
+    if args.reconcile:
+        try:
+            correction = reconcile_robosoc_nft()
+        except RoboSOCUpdateError as error:
+            print(error, file=sys.stderr)
+            return 1
+        if correction is None:
+            print('There is no active blocklist to reconcile against', file=sys.stderr)
+            return 1
+        print(', '.join(f'{key}: {count}' for key, count in correction.items()))
+        return 0
+
+    if not args.daemon:
+        try:
+            run_robosoc_update(metrics_file_path=args.metrics_file, run_log_path=args.run_log)
+        except RoboSOCUpdateError as error:
+            print(error, file=sys.stderr)
+            return 1
+        return 0
+
+    # systemd stops the service with SIGTERM, finish the current run and exit
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    run_daemon(
+        args.interval, args.jitter, args.retry, args.max_backoff, args.status_file, stop, args.metrics_file,
+        args.run_log,
+    )
+    return 0
 
 
 if __name__ == '__main__':
-    process_robosoc_ipblocklist()
+    sys.exit(main())
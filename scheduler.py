@@ -0,0 +1,119 @@
+# stdlib
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+# lib
+# local
+
+
+__all__ = [
+    'MAX_WORKERS',
+    'REGISTRY',
+    'plan_tests',
+    'register',
+    'run_tests',
+]
+
+# Number of tests that may run at the same time
+MAX_WORKERS = 16
+
+# All registered tests keyed by test_id
+REGISTRY = {}
+
+
+def register(test_id, block, ignore_message, inputs=(), args=(), timeout=None, depends=()):
+    """
+    Decorator that adds a test function to the REGISTRY so data_blob() runs it
+    :param test_id: The id of the test, the test's bit in the maps is 2 ** test_id
+    :param block: The block the test belongs to, 'hardware', 'config' or 'ping'
+    :param ignore_message: The result recorded for the test when it is ignored for the host_status
+    :param inputs: The session data read by the test, any of 'cidata', 'instanciated_metadata',
+                   'instanciated_infra' and 'sysfs'
+    :param args: Test values passed to the test after the test_id
+    :param timeout: Seconds the block of the test may take, the test is passed a time.monotonic() `deadline` when
+                    set. The tests of a block share one deadline counted from when the first of them starts.
+    :param depends: The test_ids that must finish before this test starts
+    :return: The decorator
+    """
+    def decorator(func):
+        if test_id in REGISTRY:
+            raise ValueError(f'Test id {test_id} is registered to both {REGISTRY[test_id]["name"]} and {func.__name__}')
+        REGISTRY[test_id] = {
+            'id': test_id,
+            'name': func.__name__,
+            'func': func,
+            'block': block,
+            'ignore_message': ignore_message,
+            'inputs': tuple(inputs),
+            'args': tuple(args),
+            'timeout': timeout,
+            'depends': tuple(depends),
+        }
+        return func
+    return decorator
+
+
+def plan_tests(details):
+    """
+    Records every registered test that is ignored for the host_status in a single update so they are never run
+    :param details: The results.ResultAccumulator holding the fail, ignore and warn maps for the host_status
+    :return: The ids of the tests that can warn or fail and so must be run
+    """
+    registered_map = sum(2 ** test_id for test_id in REGISTRY)
+    ignore_map = registered_map & details.ignore
+    result = ['' for _ in range(len(details.result))]
+    active = []
+    for test_id, test in REGISTRY.items():
+        if 2 ** test_id & ignore_map:
+            result[test_id] = test['ignore_message']
+        else:
+            active.append(test_id)
+    details.update(result, details.fail, details.ignore, details.warn, 0b0, 0b0, ignore_map, 0b0)
+    return active
+
+
+def _run_test(test, details, deadlines, lock):
+    kwargs = {}
+    if test['timeout'] is not None:
+        # The first test of the block to start sets the deadline, time spent queued for a worker is not counted
+        with lock:
+            kwargs['deadline'] = deadlines.setdefault(test['block'], time.monotonic() + test['timeout'])
+    test['func'](details, test['id'], *test['args'], **kwargs)
+
+
+def run_tests(details, test_ids=None, max_workers=MAX_WORKERS):
+    """
+    Runs registered tests on a pool of workers, a test starts as soon as all the tests it depends on have finished
+    :param details: The results.ResultAccumulator the tests record into
+    :param test_ids: The ids of the tests to run, all registered tests when None
+    :param max_workers: The number of tests that may run at the same time
+    :return: None
+    """
+    if test_ids is None:
+        test_ids = REGISTRY.keys()
+    pending = {test_id: REGISTRY[test_id] for test_id in test_ids}
+    for test in pending.values():
+        for dependency in test['depends']:
+            if dependency not in REGISTRY:
+                raise ValueError(f'Test {test["name"]} depends on unregistered test id {dependency}')
+
+    # Dependencies that are not part of this run count as already finished
+    finished = set(REGISTRY) - set(pending)
+    running = {}
+    # block -> the deadline shared by its tests, set when the first of them starts
+    deadlines = {}
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            ready = [test for test in pending.values() if finished.issuperset(test['depends'])]
+            if not ready and not running:
+                names = ', '.join(test['name'] for test in pending.values())
+                raise ValueError(f'Circular test dependencies between {names}')
+            for test in sorted(ready, key=lambda test: test['id']):
+                del pending[test['id']]
+                running[executor.submit(_run_test, test, details, deadlines, lock)] = test['id']
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished.add(running.pop(future))
+                future.result()
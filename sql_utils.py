@@ -1,41 +1,199 @@
 # stdlib
 import json
-import pickle   # Used for serializing/deserializing Python objects
+from types import MappingProxyType
 import socket
 import sqlite3
 import subprocess
+import threading
 # lib
 import yaml
 
 
 __all__ = [
+    'decode_map',
+    'encode_map',
     'get_cidata',
+    'get_connection',
     'get_instanciated_infra',
     'get_instanciated_metadata',
+    'get_session_value',
     'get_test_details',
     'get_test_bit_map',
+    'get_test_bit_maps',
+    'invalidate_session_constants',
+    'migrate_pickle_layout',
+    'migrate_test_map_key',
+    'migrate_text_maps',
+    'refresh_session_constants',
     'set_up_sqlite',
 ]
 
+# The installer database
+DB_PATH = '/etc/cloudcix/pod/installer.db'
+# Prepared statements kept per connection
+CACHED_STATEMENTS = 128
+
+# Columns of the session_constants table
+SESSION_CONSTANTS = ('cidata', 'instanciated_metadata', 'instanciated_infra')
+
+# Bit maps are wider than SQLite's signed 64-bit INTEGER so each map is stored as two INTEGER columns,
+# <name>_lo holding bits 0 to 62 and <name>_hi holding bits 63 to 125. Both halves are non-negative.
+MAP_LOW_BITS = 63
+_MAP_LOW_MASK = 2 ** MAP_LOW_BITS - 1
+# The bit map columns of the test_details table
+DETAIL_MAPS = ('fail', 'ignore', 'warn', 'fail_map', 'warn_map', 'ignore_map', 'pass_map')
+
+# One connection per thread, opened on first use and kept for the life of the thread
+_connections = threading.local()
+
+# Session constants and test maps are decoded from installer.db once per session generation and then served from memory.
+# The generation is bumped whenever the session constants are rewritten so a stale copy is never served.
+# Callers share the cached objects and must not modify them.
+_session_generation = 0
+_session_cache = {}
+_session_lock = threading.Lock()
+
+
+def get_connection():
+    """
+    The single access path to installer.db. Each thread reuses one connection with a WAL journal, so commits do not
+    fsync twice and readers are not blocked by a writer, and with synchronous=NORMAL which is safe in WAL mode.
+    Use the connection as a context manager to commit or roll back a transaction.
+    :return: The sqlite3 connection for the calling thread
+    """
+    conn = getattr(_connections, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode = WAL;')
+        conn.execute('PRAGMA synchronous = NORMAL;')
+        _connections.conn = conn
+    return conn
+
+
+def encode_map(bit_map):
+    """
+    :param bit_map: A test bit map
+    :return: The (hi, lo) INTEGER pair the map is stored as
+    """
+    return bit_map >> MAP_LOW_BITS, bit_map & _MAP_LOW_MASK
+
+
+def decode_map(hi, lo):
+    """
+    :param hi: The <name>_hi column of a stored bit map
+    :param lo: The <name>_lo column of a stored bit map
+    :return: The test bit map
+    """
+    return (hi << MAP_LOW_BITS) | lo
+
+
+def _map_columns(names):
+    return ', '.join(f'{name}_hi, {name}_lo' for name in names)
+
+
+def _map_values(bit_maps):
+    return tuple(half for bit_map in bit_maps for half in encode_map(bit_map))
+
+
+def _decode_maps(row):
+    return tuple(decode_map(row[i], row[i + 1]) for i in range(0, len(row), 2))
+
+
+def _to_json(value):
+    # Session constants are stored as JSON text, values JSON cannot hold (e.g. YAML dates) are stored as strings
+    return json.dumps(value, default=str)
+
+
+def _create_tables(cur):
+    # Session constants are JSON documents so single fields can be read with json_extract()
+    # Each test result is its own row in test_results so one result can be read without the others
+    # Bit maps are stored as hi/lo INTEGER pairs, see encode_map()
+    cur.execute(
+        'CREATE TABLE IF NOT EXISTS test_map (name TEXT PRIMARY KEY, bit_map_hi INTEGER, bit_map_lo INTEGER);',
+    )
+    columns = ', '.join(f'{name}_hi INTEGER, {name}_lo INTEGER' for name in DETAIL_MAPS)
+    cur.execute(f'CREATE TABLE IF NOT EXISTS test_details (id INTEGER, {columns});')
+    cur.execute('CREATE TABLE IF NOT EXISTS test_results (id INTEGER PRIMARY KEY, result TEXT);')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS session_constants (id INTEGER PRIMARY KEY, cidata TEXT, instanciated_metadata TEXT,
+        instanciated_infra TEXT);
+    ''')
+    cur.execute('CREATE TABLE IF NOT EXISTS host_details (id INTEGER, host_status INTEGER, host_status_text TEXT);')
+
+
+def migrate_pickle_layout(cur):
+    """
+    Rebuilds the tables of a database written with the old layout, where session_constants held pickled dicts and
+    test_details.result held a pickled list, in the JSON layout. Does nothing for a database already migrated.
+    The rows are not kept, set_up_sqlite() clears every table for the new session anyway.
+    :param cur: A cursor on installer.db, the caller commits
+    :return: True if the database was migrated
+    """
+    cur.execute('PRAGMA table_info(test_details);')
+    if 'result' not in [column[1] for column in cur.fetchall()]:
+        return False
+
+    cur.execute('DROP TABLE test_details;')
+    cur.execute('DROP TABLE IF EXISTS session_constants;')
+    _create_tables(cur)
+    return True
+
+
+def migrate_text_maps(cur):
+    """
+    Rebuilds the tables of a database written with the old layout, where test_map and test_details held the bit
+    maps as decimal TEXT, with hi/lo INTEGER columns. Does nothing for a database already migrated.
+    The rows are not kept, set_up_sqlite() clears every table for the new session anyway.
+    :param cur: A cursor on installer.db, the caller commits
+    :return: True if the database was migrated
+    """
+    cur.execute('PRAGMA table_info(test_map);')
+    test_map_columns = [column[1] for column in cur.fetchall()]
+    cur.execute('PRAGMA table_info(test_details);')
+    test_details_columns = [column[1] for column in cur.fetchall()]
+    if 'bit_map' not in test_map_columns and 'fail_map' not in test_details_columns:
+        return False
+
+    if 'bit_map' in test_map_columns:
+        cur.execute('DROP TABLE test_map;')
+    if 'fail_map' in test_details_columns:
+        cur.execute('DROP TABLE test_details;')
+    _create_tables(cur)
+    return True
+
+
+def migrate_test_map_key(cur):
+    """
+    Rebuilds a test_map table created without the PRIMARY KEY on name. Does nothing for a database already migrated
+    or without a test_map table. The rows are not kept, set_up_sqlite() clears every table for the new session anyway.
+    :param cur: A cursor on installer.db, the caller commits
+    :return: True if the database was migrated
+    """
+    cur.execute('PRAGMA table_info(test_map);')
+    columns = cur.fetchall()
+    # A new database has no test_map table yet, _create_tables() creates it with the key
+    if not columns or any(column[1] == 'name' and column[5] for column in columns):
+        return False
+
+    cur.execute('DROP TABLE test_map;')
+    _create_tables(cur)
+    return True
+
 
 def set_up_sqlite():
     # Create required Tables if they do not exist and clear from previous sessions
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    with get_connection() as conn:
         cur = conn.cursor()
+        # Bring a database from an older installer up to the current layout
+        migrate_pickle_layout(cur)
+        migrate_text_maps(cur)
+        migrate_test_map_key(cur)
         # Create required tables if they do not exist
-        cur.execute('CREATE TABLE IF NOT EXISTS test_map (name TEXT, bit_map TEXT);')
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS test_details (id INTEGER, result BLOB, fail TEXT, ignore TEXT, warn TEXT,
-            fail_map TEXT, warn_map TEXT, ignore_map TEXT, pass_map TEXT);
-        ''')
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS session_constants (id INTEGER, cidata BLOB, instanciated_metadata BLOB,
-            instanciated_infra BLOB);
-        ''')
-        cur.execute('CREATE TABLE IF NOT EXISTS host_details (id INTEGER, host_status INTEGER, host_status_text TEXT);')
+        _create_tables(cur)
         # Remove all data that may reside from previous sessions
         cur.execute("DELETE FROM test_map;")
         cur.execute("DELETE FROM test_details;")
+        cur.execute("DELETE FROM test_results;")
         cur.execute("DELETE FROM session_constants;")
         cur.execute("DELETE FROM host_details;")
         conn.commit()
@@ -103,63 +261,63 @@ def set_up_sqlite():
     pat_reinstall_podnet_a_fail         = 0b000000000000000000000000000000000000000000000000000000000000000000111111111111111111111111100101111000000000001100001110
 
     test_map = [
-        ('invert', str(invert)),
-        ('cop_validate_podnet_a_warn', str(cop_validate_podnet_a_warn)),
-        ('cop_validate_podnet_a_fail', str(cop_validate_podnet_a_fail)),
-        ('cop_validate_podnet_b_warn', str(cop_validate_podnet_b_warn)),
-        ('cop_validate_podnet_b_fail', str(cop_validate_podnet_b_fail)),
-        ('cop_validate_appliance_a_warn', str(cop_validate_appliance_a_warn)),
-        ('cop_validate_appliance_a_fail', str(cop_validate_appliance_a_fail)),
-        ('cop_install_podnet_a_warn', str(cop_install_podnet_a_warn)),
-        ('cop_install_podnet_a_fail', str(cop_install_podnet_a_fail)),
-        ('cop_install_podnet_b_warn', str(cop_install_podnet_b_warn)),
-        ('cop_install_podnet_b_fail', str(cop_install_podnet_b_fail)),
-        ('cop_install_appliance_a_warn', str(cop_install_appliance_a_warn)),
-        ('cop_install_appliance_a_fail', str(cop_install_appliance_a_fail)),
-        ('cop_reinstall_podnet_a_warn', str(cop_reinstall_podnet_a_warn)),
-        ('cop_reinstall_podnet_a_fail', str(cop_reinstall_podnet_a_fail)),
-        ('region_validate_podnet_a_warn', str(region_validate_podnet_a_warn)),
-        ('region_validate_podnet_a_fail', str(region_validate_podnet_a_fail)),
-        ('region_validate_podnet_b_warn', str(region_validate_podnet_b_warn)),
-        ('region_validate_podnet_b_fail', str(region_validate_podnet_b_fail)),
-        ('region_validate_appliance_a_warn', str(region_validate_appliance_a_warn)),
-        ('region_validate_appliance_a_fail', str(region_validate_appliance_a_fail)),
-        ('region_install_podnet_a_warn', str(region_install_podnet_a_warn)),
-        ('region_install_podnet_a_fail', str(region_install_podnet_a_fail)),
-        ('region_install_podnet_b_warn', str(region_install_podnet_b_warn)),
-        ('region_install_podnet_b_fail', str(region_install_podnet_b_fail)),
-        ('region_install_appliance_a_warn', str(region_install_appliance_a_warn)),
-        ('region_install_appliance_a_fail', str(region_install_appliance_a_fail)),
-        ('region_reinstall_podnet_a_warn', str(region_reinstall_podnet_a_warn)),
-        ('region_reinstall_podnet_a_fail', str(region_reinstall_podnet_a_fail)),
-        ('copregion_validate_podnet_a_warn', str(copregion_validate_podnet_a_warn)),
-        ('copregion_validate_podnet_a_fail', str(copregion_validate_podnet_a_fail)),
-        ('copregion_validate_podnet_b_warn', str(copregion_validate_podnet_b_warn)),
-        ('copregion_validate_podnet_b_fail', str(copregion_validate_podnet_b_fail)),
-        ('copregion_validate_appliance_a_warn', str(copregion_validate_appliance_a_warn)),
-        ('copregion_validate_appliance_a_fail', str(copregion_validate_appliance_a_fail)),
-        ('copregion_install_podnet_a_warn', str(copregion_install_podnet_a_warn)),
-        ('copregion_install_podnet_a_fail', str(copregion_install_podnet_a_fail)),
-        ('copregion_install_podnet_b_warn', str(copregion_install_podnet_b_warn)),
-        ('copregion_install_podnet_b_fail', str(copregion_install_podnet_b_fail)),
-        ('copregion_install_appliance_a_warn', str(copregion_install_appliance_a_warn)),
-        ('copregion_install_appliance_a_fail', str(copregion_install_appliance_a_fail)),
-        ('copregion_reinstall_podnet_a_warn', str(copregion_reinstall_podnet_a_warn)),
-        ('copregion_reinstall_podnet_a_fail', str(copregion_reinstall_podnet_a_fail)),
-        ('pat_validate_podnet_a_warn', str(pat_validate_podnet_a_warn)),
-        ('pat_validate_podnet_a_fail', str(pat_validate_podnet_a_fail)),
-        ('pat_validate_podnet_b_warn', str(pat_validate_podnet_b_warn)),
-        ('pat_validate_podnet_b_fail', str(pat_validate_podnet_b_fail)),
-        ('pat_validate_appliance_a_warn', str(pat_validate_appliance_a_warn)),
-        ('pat_validate_appliance_a_fail', str(pat_validate_appliance_a_fail)),
-        ('pat_install_podnet_a_warn', str(pat_install_podnet_a_warn)),
-        ('pat_install_podnet_a_fail', str(pat_install_podnet_a_fail)),
-        ('pat_install_podnet_b_warn', str(pat_install_podnet_b_warn)),
-        ('pat_install_podnet_b_fail', str(pat_install_podnet_b_fail)),
-        ('pat_install_appliance_a_warn', str(pat_install_appliance_a_warn)),
-        ('pat_install_appliance_a_fail', str(pat_install_appliance_a_fail)),
-        ('pat_reinstall_podnet_a_warn', str(pat_reinstall_podnet_a_warn)),
-        ('pat_reinstall_podnet_a_fail', str(pat_reinstall_podnet_a_fail)),
+        ('invert', *encode_map(invert)),
+        ('cop_validate_podnet_a_warn', *encode_map(cop_validate_podnet_a_warn)),
+        ('cop_validate_podnet_a_fail', *encode_map(cop_validate_podnet_a_fail)),
+        ('cop_validate_podnet_b_warn', *encode_map(cop_validate_podnet_b_warn)),
+        ('cop_validate_podnet_b_fail', *encode_map(cop_validate_podnet_b_fail)),
+        ('cop_validate_appliance_a_warn', *encode_map(cop_validate_appliance_a_warn)),
+        ('cop_validate_appliance_a_fail', *encode_map(cop_validate_appliance_a_fail)),
+        ('cop_install_podnet_a_warn', *encode_map(cop_install_podnet_a_warn)),
+        ('cop_install_podnet_a_fail', *encode_map(cop_install_podnet_a_fail)),
+        ('cop_install_podnet_b_warn', *encode_map(cop_install_podnet_b_warn)),
+        ('cop_install_podnet_b_fail', *encode_map(cop_install_podnet_b_fail)),
+        ('cop_install_appliance_a_warn', *encode_map(cop_install_appliance_a_warn)),
+        ('cop_install_appliance_a_fail', *encode_map(cop_install_appliance_a_fail)),
+        ('cop_reinstall_podnet_a_warn', *encode_map(cop_reinstall_podnet_a_warn)),
+        ('cop_reinstall_podnet_a_fail', *encode_map(cop_reinstall_podnet_a_fail)),
+        ('region_validate_podnet_a_warn', *encode_map(region_validate_podnet_a_warn)),
+        ('region_validate_podnet_a_fail', *encode_map(region_validate_podnet_a_fail)),
+        ('region_validate_podnet_b_warn', *encode_map(region_validate_podnet_b_warn)),
+        ('region_validate_podnet_b_fail', *encode_map(region_validate_podnet_b_fail)),
+        ('region_validate_appliance_a_warn', *encode_map(region_validate_appliance_a_warn)),
+        ('region_validate_appliance_a_fail', *encode_map(region_validate_appliance_a_fail)),
+        ('region_install_podnet_a_warn', *encode_map(region_install_podnet_a_warn)),
+        ('region_install_podnet_a_fail', *encode_map(region_install_podnet_a_fail)),
+        ('region_install_podnet_b_warn', *encode_map(region_install_podnet_b_warn)),
+        ('region_install_podnet_b_fail', *encode_map(region_install_podnet_b_fail)),
+        ('region_install_appliance_a_warn', *encode_map(region_install_appliance_a_warn)),
+        ('region_install_appliance_a_fail', *encode_map(region_install_appliance_a_fail)),
+        ('region_reinstall_podnet_a_warn', *encode_map(region_reinstall_podnet_a_warn)),
+        ('region_reinstall_podnet_a_fail', *encode_map(region_reinstall_podnet_a_fail)),
+        ('copregion_validate_podnet_a_warn', *encode_map(copregion_validate_podnet_a_warn)),
+        ('copregion_validate_podnet_a_fail', *encode_map(copregion_validate_podnet_a_fail)),
+        ('copregion_validate_podnet_b_warn', *encode_map(copregion_validate_podnet_b_warn)),
+        ('copregion_validate_podnet_b_fail', *encode_map(copregion_validate_podnet_b_fail)),
+        ('copregion_validate_appliance_a_warn', *encode_map(copregion_validate_appliance_a_warn)),
+        ('copregion_validate_appliance_a_fail', *encode_map(copregion_validate_appliance_a_fail)),
+        ('copregion_install_podnet_a_warn', *encode_map(copregion_install_podnet_a_warn)),
+        ('copregion_install_podnet_a_fail', *encode_map(copregion_install_podnet_a_fail)),
+        ('copregion_install_podnet_b_warn', *encode_map(copregion_install_podnet_b_warn)),
+        ('copregion_install_podnet_b_fail', *encode_map(copregion_install_podnet_b_fail)),
+        ('copregion_install_appliance_a_warn', *encode_map(copregion_install_appliance_a_warn)),
+        ('copregion_install_appliance_a_fail', *encode_map(copregion_install_appliance_a_fail)),
+        ('copregion_reinstall_podnet_a_warn', *encode_map(copregion_reinstall_podnet_a_warn)),
+        ('copregion_reinstall_podnet_a_fail', *encode_map(copregion_reinstall_podnet_a_fail)),
+        ('pat_validate_podnet_a_warn', *encode_map(pat_validate_podnet_a_warn)),
+        ('pat_validate_podnet_a_fail', *encode_map(pat_validate_podnet_a_fail)),
+        ('pat_validate_podnet_b_warn', *encode_map(pat_validate_podnet_b_warn)),
+        ('pat_validate_podnet_b_fail', *encode_map(pat_validate_podnet_b_fail)),
+        ('pat_validate_appliance_a_warn', *encode_map(pat_validate_appliance_a_warn)),
+        ('pat_validate_appliance_a_fail', *encode_map(pat_validate_appliance_a_fail)),
+        ('pat_install_podnet_a_warn', *encode_map(pat_install_podnet_a_warn)),
+        ('pat_install_podnet_a_fail', *encode_map(pat_install_podnet_a_fail)),
+        ('pat_install_podnet_b_warn', *encode_map(pat_install_podnet_b_warn)),
+        ('pat_install_podnet_b_fail', *encode_map(pat_install_podnet_b_fail)),
+        ('pat_install_appliance_a_warn', *encode_map(pat_install_appliance_a_warn)),
+        ('pat_install_appliance_a_fail', *encode_map(pat_install_appliance_a_fail)),
+        ('pat_reinstall_podnet_a_warn', *encode_map(pat_reinstall_podnet_a_warn)),
+        ('pat_reinstall_podnet_a_fail', *encode_map(pat_reinstall_podnet_a_fail)),
     ]
 
     ##########################################################################
@@ -172,8 +330,11 @@ def set_up_sqlite():
     for i in range(number_of_tests):
         test_result.append ("")            # Set test results to blanks
 
-    test_details_query = 'INSERT INTO test_details VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'
-    test_details_values = (1, pickle.dumps(test_result), '', '', '', str(0b0), str(0b0), str(0b0), str(0b0))
+    test_details_values = (1,) + _map_values(0b0 for _ in DETAIL_MAPS)
+    placeholders = ', '.join('?' for _ in test_details_values)
+    test_details_query = f'INSERT INTO test_details (id, {_map_columns(DETAIL_MAPS)}) VALUES ({placeholders})'
+    test_results_query = 'INSERT INTO test_results (id, result) VALUES (?, ?)'
+    test_results_values = list(enumerate(test_result))
 
     ##########################################################################
     ##                                                                      ##
@@ -188,17 +349,20 @@ def set_up_sqlite():
     instanciated_infra = create_instanciated_infra()
 
     session_query = 'INSERT INTO session_constants (id, cidata, instanciated_metadata, instanciated_infra) VALUES (?, ?, ?, ?)'
-    session_values = (1, pickle.dumps(cidata), pickle.dumps(instanciated_metadata), pickle.dumps(instanciated_infra))
+    session_values = (1, _to_json(cidata), _to_json(instanciated_metadata), _to_json(instanciated_infra))
 
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    with get_connection() as conn:
         cur = conn.cursor()
         # Add data to tables in database
-        cur.executemany('INSERT INTO test_map (name, bit_map) VALUES (?, ?)', test_map)
+        cur.executemany('INSERT INTO test_map (name, bit_map_hi, bit_map_lo) VALUES (?, ?, ?)', test_map)
         cur.execute(test_details_query, test_details_values)
+        cur.executemany(test_results_query, test_results_values)
         cur.execute(session_query, session_values)
         conn.commit()
         cur.close()
 
+    invalidate_session_constants()
+
 
 def create_cidata():
     # Metadata Session Constants
@@ -293,27 +457,109 @@ def create_instanciated_metadata():
 
 
 def get_cidata():
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    return _get_session_constant('cidata')
+
+
+def _get_session_constant(name):
+    with _session_lock:
+        key = (_session_generation, name)
+        if key not in _session_cache:
+            with get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f'SELECT {name} FROM session_constants WHERE id = 1;')
+                _session_cache[key] = json.loads(cur.fetchone()[0])
+                cur.close()
+        return _session_cache[key]
+
+
+def get_session_value(name, *keys, default=None):
+    """
+    Reads a single field of a session constant, e.g. get_session_value('instanciated_metadata', 'config.json',
+    'ipv6_subnet'). The field is taken from memory when the session constant is already cached, otherwise only that
+    field is read from installer.db with json_extract().
+    :param name: The session constant, 'cidata', 'instanciated_metadata' or 'instanciated_infra'
+    :param keys: The keys leading to the field
+    :param default: The value returned when the field does not exist, as dict.get() does
+    :return: The value of the field
+    """
+    with _session_lock:
+        cached = _session_cache.get((_session_generation, name))
+    if cached is not None:
+        value = cached
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    if name not in SESSION_CONSTANTS:
+        raise ValueError(f'{name} is not a session constant')
+    path = '$' + ''.join('.' + json.dumps(key) for key in keys)
+    query = f'SELECT json_type({name}, ?), json_extract({name}, ?) FROM session_constants WHERE id = 1;'
+    with get_connection() as conn:
         cur = conn.cursor()
-        cur.execute(f'SELECT cidata FROM session_constants WHERE id = 1;')
-        cidata = cur.fetchone()[0]
+        cur.execute(query, (path, path))
+        value_type, value = cur.fetchone()
         cur.close()
 
-    return pickle.loads(cidata)
+    # json_type() is NULL for a missing field and 'null' for a field that holds null
+    if value_type is None:
+        return default
+    # json_extract() returns objects and arrays as JSON text
+    if value_type in ('object', 'array'):
+        value = json.loads(value)
+    elif value_type in ('true', 'false'):
+        value = bool(value)
+    return value
+
+
+def invalidate_session_constants():
+    # Start a new session generation, the next read of each session constant goes back to installer.db
+    global _session_generation
+    with _session_lock:
+        _session_generation += 1
+        _session_cache.clear()
+    return None
 
 
-def get_test_bit_map(name):
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+def refresh_session_constants():
+    # Re-read the instanciated metadata and infra from the host after config.json or netplan has been rewritten
+    query = 'UPDATE session_constants SET instanciated_metadata = ?, instanciated_infra = ? WHERE id = 1;'
+    values = (_to_json(create_instanciated_metadata()), _to_json(create_instanciated_infra()))
+    with get_connection() as conn:
         cur = conn.cursor()
-        cur.execute(f"SELECT bit_map FROM test_map WHERE name = '{name}'")
-        bit_map = cur.fetchone()[0]
+        cur.execute(query, values)
+        conn.commit()
         cur.close()
 
-    return int(bit_map)
+    invalidate_session_constants()
+    return None
+
+
+def get_test_bit_maps():
+    """
+    Loads every test map from installer.db in one query. The maps are read once per session generation and then
+    served from memory, set_up_sqlite() starts a new generation when it rewrites test_map.
+    :return: A read-only mapping of test map name to bit map
+    """
+    with _session_lock:
+        key = (_session_generation, 'test_map')
+        if key not in _session_cache:
+            with get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute('SELECT name, bit_map_hi, bit_map_lo FROM test_map;')
+                test_map = {name: decode_map(hi, lo) for name, hi, lo in cur.fetchall()}
+                cur.close()
+            _session_cache[key] = MappingProxyType(test_map)
+        return _session_cache[key]
+
+
+def get_test_bit_map(name):
+    return get_test_bit_maps()[name]
 
 
 def get_host_details():
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    with get_connection() as conn:
         cur = conn.cursor()
         cur.execute(f'SELECT host_status, host_status_text FROM host_details WHERE id = 1;')
         details = cur.fetchone()
@@ -323,58 +569,41 @@ def get_host_details():
 
 
 def get_instanciated_metadata():
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
-        cur = conn.cursor()
-        cur.execute(f'SELECT instanciated_metadata FROM session_constants WHERE id = 1;')
-        instanciated_metadata = cur.fetchone()[0]
-        cur.close()
-
-    return pickle.loads(instanciated_metadata)
+    return _get_session_constant('instanciated_metadata')
 
 
 def get_instanciated_infra():
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
-        cur = conn.cursor()
-        cur.execute(f'SELECT instanciated_infra FROM session_constants WHERE id = 1;')
-        instanciated_infra = cur.fetchone()[0]
-        cur.close()
+    return _get_session_constant('instanciated_infra')
+
 
-    return pickle.loads(instanciated_infra)
+def _get_results(cur):
+    cur.execute('SELECT result FROM test_results ORDER BY id;')
+    return [row[0] for row in cur.fetchall()]
 
 
 def get_test_details():
-    # result BLOB, fail TEXT, ignore TEXT, warn TEXT, fail_map TEST, warn_map TEXT, ignore_map TEXT, pass_map TEXT
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    # fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map as hi/lo INTEGER pairs
+    with get_connection() as conn:
         cur = conn.cursor()
-        cur.execute('''
-            SELECT result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map FROM test_details WHERE id = 1;
-        ''')
+        cur.execute(f'SELECT {_map_columns(DETAIL_MAPS)} FROM test_details WHERE id = 1;')
         details = cur.fetchone()
+        result = _get_results(cur)
         cur.close()
     
-    result = pickle.loads(details[0])
-    fail = int(details[1])
-    ignore = int(details[2])
-    warn = int(details[3])
-    fail_map = int(details[4])
-    warn_map = int(details[5])
-    ignore_map = int(details[6])
-    pass_map = int(details[7])
+    fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = _decode_maps(details)
 
     return result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map
 
 
 def get_test_results():
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    with get_connection() as conn:
         cur = conn.cursor()
-        cur.execute('SELECT fail_map, warn_map, pass_map, result FROM test_details WHERE id = 1;')
+        cur.execute(f'SELECT {_map_columns(("fail_map", "warn_map", "pass_map"))} FROM test_details WHERE id = 1;')
         details = cur.fetchone()
+        result = _get_results(cur)
         cur.close()
     
-    fail_map = int(details[0])
-    warn_map = int(details[1])
-    pass_map = int(details[2])
-    result = pickle.loads(details[3])
+    fail_map, warn_map, pass_map = _decode_maps(details)
     
     return pass_map, warn_map, fail_map, result
 
@@ -382,7 +611,7 @@ def get_test_results():
 def insert_host_status(host_status, host_status_text):
     query = f"INSERT INTO host_details VALUES (?, ?, ?);"
     values = (1, host_status, host_status_text)
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    with get_connection() as conn:
         cur = conn.cursor()
         cur.execute(query, values)
         conn.commit()
@@ -391,9 +620,9 @@ def insert_host_status(host_status, host_status_text):
 
 
 def update_fail_map(fail_map):
-    query = 'UPDATE test_details SET fail_map = ? WHERE id = 1;'
-    values = (str(fail_map),)
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    query = 'UPDATE test_details SET fail_map_hi = ?, fail_map_lo = ? WHERE id = 1;'
+    values = encode_map(fail_map)
+    with get_connection() as conn:
         cur = conn.cursor()
         cur.execute(query, values)
         conn.commit()
@@ -403,17 +632,13 @@ def update_fail_map(fail_map):
 
 
 def update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map):
-    query = ('''
-        UPDATE test_details SET result = ?, fail = ?, ignore = ?, warn = ?, fail_map = ?, warn_map = ?,
-         ignore_map = ?, pass_map = ? WHERE id = 1;
-    ''')
-    values = (
-        pickle.dumps(result), str(fail), str(ignore), str(warn), str(fail_map), str(warn_map),
-        str(ignore_map), str(pass_map)
-    )
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    columns = ', '.join(f'{name}_hi = ?, {name}_lo = ?' for name in DETAIL_MAPS)
+    query = f'UPDATE test_details SET {columns} WHERE id = 1;'
+    values = _map_values((fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map))
+    with get_connection() as conn:
         cur = conn.cursor()
         cur.execute(query, values)
+        cur.executemany('INSERT OR REPLACE INTO test_results (id, result) VALUES (?, ?);', enumerate(result))
         conn.commit()
         cur.close()
     
@@ -422,10 +647,11 @@ def update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_m
 
 def update_test_levels(fail, ignore, warn):
     query = (
-        f"UPDATE test_details SET fail = ?, ignore = ?, warn = ? WHERE id = 1;"
+        f"UPDATE test_details SET fail_hi = ?, fail_lo = ?, ignore_hi = ?, ignore_lo = ?, warn_hi = ?, warn_lo = ? "
+        f"WHERE id = 1;"
     )
-    values = (str(fail), str(ignore), str(warn))
-    with sqlite3.connect('/etc/cloudcix/pod/installer.db') as conn:
+    values = _map_values((fail, ignore, warn))
+    with get_connection() as conn:
         cur = conn.cursor()
         cur.execute(query, values)
         conn.commit()
@@ -1,18 +1,20 @@
 # stdlib
 import ipaddress
 import os
+import time
 # lib
 import psutil
 from ping3 import ping
 # local
-from interface_utils import read_interface_file
+from host_status import cop, copregion, pat, region
+from interface_utils import get_interface_snapshot, read_interface_file
+from scheduler import register
 from sql_utils import (
     # methods
     get_cidata,
     get_instanciated_infra,
     get_instanciated_metadata,
-    get_test_details,
-    update_test_details,
+    get_session_value,
 )
 
 
@@ -21,22 +23,16 @@ from sql_utils import (
 #######################################################
 
 # 1.1.1 CPU
-def hard_core_coun(test_id, cores_min):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(0, 'hardware', args=(20,), ignore_message='1.1.1 Hardware CPU-Core Count  - Ignore')
+def hard_core_coun(details, test_id, cores_min):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '1.1.1 Hardware CPU-Core Count  - Pass - Count = '
     warn_message   = '1.1.1 Hardware CPU-Core Count  - Warn - Count = '
     fail_message   = '1.1.1 Hardware CPU-Core Count  - Fail - Count = '
-    ignore_message = '1.1.1 Hardware CPU-Core Count  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                        # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     cores = os.cpu_count()
 
     if cores >= cores_min:                                           # Test pass
@@ -49,26 +45,20 @@ def hard_core_coun(test_id, cores_min):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {cores}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 1.2.1 RAM
-def hard_ram_count(test_id, ram_min):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(1, 'hardware', args=(8,), ignore_message='1.2.1 Hardware RAM Count       - Ignore')
+def hard_ram_count(details, test_id, ram_min):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '1.2.1 Hardware RAM Count       - Pass - Count = '
     warn_message   = '1.2.1 Hardware RAM Count       - Warn - Count = '
     fail_message   = '1.2.1 Hardware RAM Count       - Fail - Count = '
-    ignore_message = '1.2.1 Hardware RAM Count       - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                    # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     ram = int((psutil.virtual_memory()).total / 1E9)
 
     if ram >= ram_min:                                          # Test pass
@@ -82,26 +72,20 @@ def hard_ram_count(test_id, ram_min):
 
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {ram}GB'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 1.3.1 Storage
-def hard_stor_coun(test_id, storage_min):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(2, 'hardware', args=(300,), ignore_message='1.3.1 Hardware Storage         - Ignore')
+def hard_stor_coun(details, test_id, storage_min):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '1.3.1 Hardware Storage         - Pass - Count = '
     warn_message   = '1.3.1 Hardware Storage         - Warn - Count = '
     fail_message   = '1.3.1 Hardware Storage         - Fail - Count = '
-    ignore_message = '1.3.1 Hardware Storage         - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     storage = 400   # Replace this with actual reading code
 
     if storage >= storage_min:                                          # Test pass
@@ -114,27 +98,21 @@ def hard_stor_coun(test_id, storage_min):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {storage}GB'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 1.4.1 PodNet Port
-def hard_pprt_coun(test_id, ports_min):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(3, 'hardware', inputs=('sysfs',), args=(5,), ignore_message='1.4.1 Hardware PodNet Ports    - Ignore')
+def hard_pprt_coun(details, test_id, ports_min):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '1.4.1 Hardware PodNet Ports    - Pass - Count = '
     warn_message   = '1.4.1 Hardware PodNet Ports    - Warn - Count = '
     fail_message   = '1.4.1 Hardware PodNet Ports    - Fail - Count = '
-    ignore_message = '1.4.1 Hardware PodNet Ports    - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    ports = len([port for port in os.listdir('/sys/class/net/') if port not in ['lo', 'docker0']])
+    ports = len([port for port in get_interface_snapshot().names() if port not in ['lo', 'docker0']])
 
     if ports >= ports_min:                                             # Test pass
         pass_map += test_map_bit
@@ -146,27 +124,21 @@ def hard_pprt_coun(test_id, ports_min):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {ports}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 1.4.2 Appliance Port
-def hard_aprt_coun(test_id, ports_min):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(4, 'hardware', inputs=('sysfs',), args=(1,), ignore_message='1.4.2 Hardware Appliance Ports - Ignore')
+def hard_aprt_coun(details, test_id, ports_min):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '1.4.2 Hardware Appliance Ports - Pass - Count = '
     warn_message   = '1.4.2 Hardware Appliance Ports - Warn - Count = '
     fail_message   = '1.4.2 Hardware Appliance Ports - Fail - Count = '
-    ignore_message = '1.4.2 Hardware Appliance Ports - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    ports = len([port for port in os.listdir('/sys/class/net/') if port not in ['lo', 'docker0']])
+    ports = len([port for port in get_interface_snapshot().names() if port not in ['lo', 'docker0']])
 
     if ports >= ports_min:                                             # Test pass
         pass_map += test_map_bit
@@ -178,26 +150,20 @@ def hard_aprt_coun(test_id, ports_min):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {ports}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.1.1 Public Port Operstate
-def hard_publ_oper(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(5, 'hardware', inputs=('sysfs',), ignore_message='2.1.1 Hardware public0  - Ignore')
+def hard_publ_oper(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.1.1 Hardware public0  - Pass - Operstate = '
     warn_message   = '2.1.1 Hardware public0  - Warn - Operstate = '
     fail_message   = '2.1.1 Hardware public0  - Fail - Operstate = '
-    ignore_message = '2.1.1 Hardware public0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     operstate = read_interface_file('public0', 'operstate')
 
     if operstate == 'up':                                               # Test pass
@@ -210,26 +176,20 @@ def hard_publ_oper(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {operstate}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.1.2 Public Port Carrier
-def hard_publ_carr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(6, 'hardware', inputs=('sysfs',), ignore_message='2.1.2 Hardware public0  - Ignore')
+def hard_publ_carr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.1.2 Hardware public0  - Pass - Carrier = '
     warn_message   = '2.1.2 Hardware public0  - Warn - Carrier = '
     fail_message   = '2.1.2 Hardware public0  - Fail - Carrier = '
-    ignore_message = '2.1.2 Hardware public0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     carrier = read_interface_file('public0', 'carrier')
 
     if carrier == '1':                                                  # Test pass
@@ -242,30 +202,23 @@ def hard_publ_carr(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {carrier}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.1.3 Public Port Ethernet Name
-def hard_publ_ethn(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(7, 'hardware', inputs=('instanciated_infra', 'instanciated_metadata'), ignore_message='2.1.3 Hardware public0  - Ignore')
+def hard_publ_ethn(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.1.3 Hardware public0  - Pass - Ethernet Name Match'
     warn_message   = '2.1.3 Hardware public0  - Warn - Ethernet Name = '
     fail_message   = '2.1.3 Hardware public0  - Fail - Ethernet Name = '
-    ignore_message = '2.1.3 Hardware public0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     instanciated_infra = get_instanciated_infra()
-    instanciated_metadata = get_instanciated_metadata()
     metadata_field = f'{instanciated_infra["hostname"].replace("-", "_")}_public_ifname'
-    metadata_name = instanciated_metadata['config.json'].get(metadata_field, '')
+    metadata_name = get_session_value('instanciated_metadata', 'config.json', metadata_field, default='')
     infra_name = 'Not Found'
     try:
         ethernets = instanciated_infra['netplan']['network']['ethernets']
@@ -286,26 +239,20 @@ def hard_publ_ethn(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {metadata_name} != {infra_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.2.1 Management Port Operstate
-def hard_mgmt_oper(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(8, 'hardware', inputs=('sysfs',), ignore_message='2.2.1 Hardware mgmt0  - Ignore')
+def hard_mgmt_oper(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.2.1 Hardware mgmt0  - Pass - Operstate = '
     warn_message   = '2.2.1 Hardware mgmt0  - Warn - Operstate = '
     fail_message   = '2.2.1 Hardware mgmt0  - Fail - Operstate = '
-    ignore_message = '2.2.1 Hardware mgmt0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     operstate = read_interface_file('mgmt0', 'operstate')
 
     if operstate == 'up':                                               # Test pass
@@ -318,26 +265,20 @@ def hard_mgmt_oper(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {operstate}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.2.2 Management Port Carrier
-def hard_mgmt_carr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(9, 'hardware', inputs=('sysfs',), ignore_message='2.2.2 Hardware mgmt0  - Ignore')
+def hard_mgmt_carr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.2.2 Hardware mgmt0  - Pass - Carrier = '
     warn_message   = '2.2.2 Hardware mgmt0  - Warn - Carrier = '
     fail_message   = '2.2.2 Hardware mgmt0  - Fail - Carrier = '
-    ignore_message = '2.2.2 Hardware mgmt0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     carrier = read_interface_file('mgmt0', 'carrier')
 
     if carrier == '1':                                                  # Test pass
@@ -350,31 +291,24 @@ def hard_mgmt_carr(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {carrier}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.2.3 Management Port Ethernet Name
-def hard_mgmt_ethn(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(10, 'hardware', inputs=('instanciated_infra', 'instanciated_metadata'), ignore_message='2.2.3 Hardware mgmt0  - Ignore')
+def hard_mgmt_ethn(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.2.3 Hardware mgmt0  - Pass - Ethernet Name Match'
     warn_message   = '2.2.3 Hardware mgmt0  - Warn - Ethernet Name = '
     fail_message   = '2.2.3 Hardware mgmt0  - Fail - Ethernet Name = '
-    ignore_message = '2.2.3 Hardware mgmt0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     instanciated_infra = get_instanciated_infra()
-    instanciated_metadata = get_instanciated_metadata()
 
     metadata_field = f'{instanciated_infra["hostname"].replace("-", "_")}_mgmt_ifname'
-    metadata_name = instanciated_metadata['config.json'].get(metadata_field, '')
+    metadata_name = get_session_value('instanciated_metadata', 'config.json', metadata_field, default='')
     infra_name = 'Not Found'
     try:
         ethernets = instanciated_infra['netplan']['network']['ethernets']
@@ -395,26 +329,20 @@ def hard_mgmt_ethn(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {metadata_name} != {infra_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.3.1 OOB Port Operstate
-def hard_oob__oper(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(11, 'hardware', inputs=('sysfs',), ignore_message='2.3.1 Hardware oob0  - Ignore')
+def hard_oob__oper(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.3.1 Hardware oob0  - Pass - Operstate = '
     warn_message   = '2.3.1 Hardware oob0  - Warn - Operstate = '
     fail_message   = '2.3.1 Hardware oob0  - Fail - Operstate = '
-    ignore_message = '2.3.1 Hardware oob0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     operstate = read_interface_file('oob0', 'operstate')
 
     if operstate == 'up':                                               # Test pass
@@ -427,26 +355,20 @@ def hard_oob__oper(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {operstate}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.3.2 OOB Port Carrier
-def hard_oob__carr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(12, 'hardware', inputs=('sysfs',), ignore_message='2.3.2 Hardware oob0  - Ignore')
+def hard_oob__carr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.3.2 Hardware oob0  - Pass - Carrier = '
     warn_message   = '2.3.2 Hardware oob0  - Warn - Carrier = '
     fail_message   = '2.3.2 Hardware oob0  - Fail - Carrier = '
-    ignore_message = '2.3.2 Hardware oob0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     carrier = read_interface_file('oob0', 'carrier')
 
     if carrier == '1':                                                  # Test pass
@@ -459,31 +381,24 @@ def hard_oob__carr(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {carrier}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.3.3 OOOB Port Ethernet Name
-def hard_oob__ethn(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(13, 'hardware', inputs=('instanciated_infra', 'instanciated_metadata'), ignore_message='2.3.3 Hardware oob0  - Ignore')
+def hard_oob__ethn(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.3.3 Hardware oob0  - Pass - Ethernet Name Match'
     warn_message   = '2.3.3 Hardware oob0  - Warn - Ethernet Name = '
     fail_message   = '2.3.3 Hardware oob0  - Fail - Ethernet Name = '
-    ignore_message = '2.3.3 Hardware oob0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     instanciated_infra = get_instanciated_infra()
-    instanciated_metadata = get_instanciated_metadata()
 
     metadata_field = f'{instanciated_infra["hostname"].replace("-", "_")}_oob_ifname'
-    metadata_name = instanciated_metadata['config.json'].get(metadata_field, '')
+    metadata_name = get_session_value('instanciated_metadata', 'config.json', metadata_field, default='')
     infra_name = 'Not Found'
     try:
         ethernets = instanciated_infra['netplan']['network']['ethernets']
@@ -504,26 +419,20 @@ def hard_oob__ethn(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {metadata_name} != {infra_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.4.1 Private Port Operstate - Region Flavor Pods
-def hard_priv_oper(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(14, 'hardware', inputs=('sysfs',), ignore_message='2.4.1 Hardware private0  - Ignore')
+def hard_priv_oper(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.4.1 Hardware private0  - Pass - Operstate = '
     warn_message   = '2.4.1 Hardware private0  - Warn - Operstate = '
     fail_message   = '2.4.1 Hardware private0  - Fail - Operstate = '
-    ignore_message = '2.4.1 Hardware private0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                           # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     operstate = read_interface_file('private0', 'operstate')
 
     if operstate == 'up':                                                # Test pass
@@ -536,26 +445,20 @@ def hard_priv_oper(test_id):
         elif test_map_bit & warn:                                        # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {operstate}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.4.2 Private Port Carrier - Region Flavor Pods
-def hard_priv_carr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(15, 'hardware', inputs=('sysfs',), ignore_message='2.4.2 Hardware private0  - Ignore')
+def hard_priv_carr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.4.2 Hardware private0  - Pass - Carrier = '
     warn_message   = '2.4.2 Hardware private0  - Warn - Carrier = '
     fail_message   = '2.4.2 Hardware private0  - Fail - Carrier = '
-    ignore_message = '2.4.2 Hardware private0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                         # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     carrier = read_interface_file('private0', 'carrier')
 
     if carrier == '1':                                                # Test pass
@@ -568,30 +471,23 @@ def hard_priv_carr(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {carrier}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.4.3 Private Port Ethernet Name - Region Flavor Pods
-def hard_priv_ethn(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(16, 'hardware', inputs=('instanciated_infra', 'instanciated_metadata'), ignore_message='2.4.3 Hardware private0  - Ignore')
+def hard_priv_ethn(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.4.3 Hardware private0  - Pass - Ethernet Name Match'
     warn_message   = '2.4.3 Hardware private0  - Warn - Ethernet Name = '
     fail_message   = '2.4.3 Hardware private0  - Fail - Ethernet Name = '
-    ignore_message = '2.4.3 Hardware private0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                         # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     instanciated_infra = get_instanciated_infra()
-    instanciated_metadata = get_instanciated_metadata()
     metadata_field = f'{instanciated_infra["hostname"].replace("-", "_")}_private_ifname'
-    metadata_name = instanciated_metadata['config.json'].get(metadata_field, '')
+    metadata_name = get_session_value('instanciated_metadata', 'config.json', metadata_field, default='')
     infra_name = 'Not Found'
     try:
         ethernets = instanciated_infra['netplan']['network']['ethernets']
@@ -612,26 +508,20 @@ def hard_priv_ethn(test_id):
         elif test_map_bit & warn:                                      # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {metadata_name} != {infra_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.5.1 Inter Port Operstate - Region Flavor Pods
-def hard_intr_oper(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(17, 'hardware', inputs=('sysfs',), ignore_message='2.5.1 Hardware inter0  - Ignore')
+def hard_intr_oper(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.5.1 Hardware inter0  - Pass - Operstate = '
     warn_message   = '2.5.1 Hardware inter0  - Warn - Operstate = '
     fail_message   = '2.5.1 Hardware inter0  - Fail - Operstate = '
-    ignore_message = '2.5.1 Hardware inter0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                          # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     operstate = read_interface_file('inter0', 'operstate')
 
     if operstate == 'up':                                             # Test pass
@@ -644,26 +534,20 @@ def hard_intr_oper(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {operstate}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.5.2 Inter Port Carrier - Region Flavor Pods
-def hard_intr_carr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(18, 'hardware', inputs=('sysfs',), ignore_message='2.5.2 Hardware inter0  - Ignore')
+def hard_intr_carr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.5.2 Hardware inter0  - Pass - Carrier = '
     warn_message   = '2.5.2 Hardware inter0  - Warn - Carrier = '
     fail_message   = '2.5.2 Hardware inter0  - Fail - Carrier = '
-    ignore_message = '2.5.2 Hardware inter0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                         # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     carrier = read_interface_file('inter0', 'carrier')
 
     if carrier == '1':                                                # Test pass
@@ -676,30 +560,23 @@ def hard_intr_carr(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {carrier}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 2.5.3 Inter Port Ethernet Name - Region Flavor Pods
-def hard_intr_ethn(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(19, 'hardware', inputs=('instanciated_infra', 'instanciated_metadata'), ignore_message='2.5.3 Hardware inter0  - Ignore')
+def hard_intr_ethn(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '2.5.3 Hardware inter0  - Pass - Ethernet Name Match'
     warn_message   = '2.5.3 Hardware inter0  - Warn - Ethernet Name = '
     fail_message   = '2.5.3 Hardware inter0  - Fail - Ethernet Name = '
-    ignore_message = '2.5.3 Hardware inter0  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                        # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     instanciated_infra = get_instanciated_infra()
-    instanciated_metadata = get_instanciated_metadata()
     metadata_field = f'{instanciated_infra["hostname"].replace("-", "_")}_inter_ifname'
-    metadata_name = instanciated_metadata['config.json'].get(metadata_field, '')
+    metadata_name = get_session_value('instanciated_metadata', 'config.json', metadata_field, default='')
     infra_name = 'Not Found'
     try:
         ethernets = instanciated_infra['netplan']['network']['ethernets']
@@ -720,26 +597,20 @@ def hard_intr_ethn(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {metadata_name} != {infra_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 # 3.1.1 Instanciated and CIDATA config.json match
-def config_matches(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(20, 'config', inputs=('cidata', 'instanciated_metadata'), ignore_message='3.1.1 Instanciated and CIDATA config.json  - Ignore')
+def config_matches(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.1.1 Instanciated and CIDATA config.json  - Pass - match'
     warn_message   = '3.1.1 Instanciated and CIDATA config.json  - Warn - not a match '
     fail_message   = '3.1.1 Instanciated and CIDATA config.json  - Fail - not a match'
-    ignore_message = '3.1.1 Instanciated and CIDATA config.json  - Ignore'
 
     test_map_bit = 2**test_id
 
-    if test_map_bit & ignore:                                          # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
     cidata = get_cidata()
     instanciated_metadata = get_instanciated_metadata()
 
@@ -753,29 +624,22 @@ def config_matches(test_id):
         elif test_map_bit & warn:                                     # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.1 Validation of pod_number from Instantiated Metadata config.json
-def inst_conf_pnum(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(21, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.1 Instanciated config.json `pod_number` - Ignore')
+def inst_conf_pnum(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.1 Instanciated config.json `pod_number` - Pass - in range'
     warn_message   = '3.2.1 Instanciated config.json `pod_number` - Warn - not in range'
     fail_message   = '3.2.1 Instanciated config.json `pod_number` - Fail - not in range'
-    ignore_message = '3.2.1 Instanciated config.json `pod_number` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    pod_number = instanciated_metadata['config.json'].get('pod_number', -1)
+    pod_number = get_session_value('instanciated_metadata', 'config.json', 'pod_number', default=-1)
 
     if int(pod_number) in range(0, 255):                            # Test pass
         pass_map += test_map_bit
@@ -787,29 +651,22 @@ def inst_conf_pnum(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.2 Validation of pod_name from Instantiated Metadata config.json
-def inst_conf_pnam(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(22, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.2 Instanciated config.json `pod_name` - Ignore')
+def inst_conf_pnam(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.2 Instanciated config.json `pod_name` - Pass - Pod Name ='
     warn_message   = '3.2.2 Instanciated config.json `pod_name` - Warn - Pod Name ='
     fail_message   = '3.2.2 Instanciated config.json `pod_name` - Fail - Pod Name ='
-    ignore_message = '3.2.2 Instanciated config.json `pod_name` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    pod_name = instanciated_metadata['config.json'].get('pod_name', '')
+    pod_name = get_session_value('instanciated_metadata', 'config.json', 'pod_name', default='')
 
     if pod_name != '':                                              # Test pass
         pass_map += test_map_bit
@@ -821,29 +678,22 @@ def inst_conf_pnam(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message} {pod_name}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.3 Validation of blend from Instantiated Metadata config.json
-def inst_conf_blen(test_id, allowed_blends):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(23, 'config', inputs=('instanciated_metadata',), args=([cop, region, copregion, pat],), ignore_message='3.2.3 Instanciated config.json `blend` - Ignore')
+def inst_conf_blen(details, test_id, allowed_blends):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.3 Instanciated config.json `blend` - Pass - Valid'
     warn_message   = '3.2.3 Instanciated config.json `blend` - Warn - Invalid'
     fail_message   = '3.2.3 Instanciated config.json `blend` - Fail - Invalid'
-    ignore_message = '3.2.3 Instanciated config.json `blend` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    blend = instanciated_metadata['config.json'].get('blend', 0)
+    blend = get_session_value('instanciated_metadata', 'config.json', 'blend', default=0)
 
     if int(blend) in allowed_blends:                                # Test pass
         pass_map += test_map_bit
@@ -855,29 +705,22 @@ def inst_conf_blen(test_id, allowed_blends):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.4 Validation of `podnet_a_enabled` from Instantiated Metadata config.json
-def inst_conf_aena(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(24, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.4 Instanciated config.json `podnet_a_enabled` - Ignore')
+def inst_conf_aena(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.4 Instanciated config.json `podnet_a_enabled` - Pass - is False'
     warn_message   = '3.2.4 Instanciated config.json `podnet_a_enabled` - Warn - is True'
     fail_message   = '3.2.4 Instanciated config.json `podnet_a_enabled` - Fail - is True'
-    ignore_message = '3.2.4 Instanciated config.json `podnet_a_enabled` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    podnet_a_enabled = instanciated_metadata['config.json'].get('podnet_a_enabled', True)
+    podnet_a_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_a_enabled', default=True)
 
     if podnet_a_enabled is False:                                    # Test pass
         pass_map += test_map_bit
@@ -889,29 +732,22 @@ def inst_conf_aena(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.5 Validation of `podnet_a_enabled` from Instantiated Metadata config.json
-def inst_conf_aenb(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(25, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.5 Instanciated config.json `podnet_a_enabled` - Ignore')
+def inst_conf_aenb(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.5 Instanciated config.json `podnet_a_enabled` - Pass - Boolean'
     warn_message   = '3.2.5 Instanciated config.json `podnet_a_enabled` - Warn - not Boolean'
     fail_message   = '3.2.5 Instanciated config.json `podnet_a_enabled` - Fail - not Boolean'
-    ignore_message = '3.2.5 Instanciated config.json `podnet_a_enabled` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    podnet_a_enabled = instanciated_metadata['config.json'].get('podnet_a_enabled', 123)
+    podnet_a_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_a_enabled', default=123)
 
     if type(podnet_a_enabled) is bool:                               # Test pass
         pass_map += test_map_bit
@@ -923,29 +759,22 @@ def inst_conf_aenb(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.6 Validation of `podnet_b_enabled` from Instantiated Metadata config.json
-def inst_conf_bena(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(26, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.6 Instanciated config.json `podnet_b_enabled` - Ignore')
+def inst_conf_bena(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.6 Instanciated config.json `podnet_b_enabled` - Pass - is False'
     warn_message   = '3.2.6 Instanciated config.json `podnet_b_enabled` - Warn - is True'
     fail_message   = '3.2.6 Instanciated config.json `podnet_b_enabled` - Fail - is True'
-    ignore_message = '3.2.6 Instanciated config.json `podnet_b_enabled` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    podnet_b_enabled = instanciated_metadata['config.json'].get('podnet_b_enabled', True)
+    podnet_b_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_b_enabled', default=True)
 
     if podnet_b_enabled is False:                                    # Test pass
         pass_map += test_map_bit
@@ -957,29 +786,22 @@ def inst_conf_bena(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.7 Validation of `podnet_b_enabled` from Instantiated Metadata config.json
-def inst_conf_benb(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(27, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.7 Instanciated config.json `podnet_b_enabled` - Ignore')
+def inst_conf_benb(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.7 Instanciated config.json `podnet_b_enabled` - Pass - Boolean'
     warn_message   = '3.2.7 Instanciated config.json `podnet_b_enabled` - Warn - not Boolean'
     fail_message   = '3.2.7 Instanciated config.json `podnet_b_enabled` - Fail - not Boolean'
-    ignore_message = '3.2.7 Instanciated config.json `podnet_b_enabled` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    podnet_b_enabled = instanciated_metadata['config.json'].get('podnet_b_enabled', 123)
+    podnet_b_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_b_enabled', default=123)
 
     if type(podnet_b_enabled) is bool:                               # Test pass
         pass_map += test_map_bit
@@ -991,30 +813,23 @@ def inst_conf_benb(test_id):
         elif test_map_bit & warn:                                   # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.8 Validation of `podnet_a_enabled` and `podnet_b_enabled` from Instantiated Metadata config.json
-def inst_conf_aben(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(28, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.8 Instanciated config.json `podnet_a_enabled` and `podnet_b_enabled` - Ignore')
+def inst_conf_aben(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.8 Instanciated config.json `podnet_a_enabled` and `podnet_b_enabled` - Pass - both are not True'
     warn_message   = '3.2.8 Instanciated config.json `podnet_a_enabled` and `podnet_b_enabled` - Warn - both are True'
     fail_message   = '3.2.8 Instanciated config.json `podnet_a_enabled` and `podnet_b_enabled` - Fail - both are True'
-    ignore_message = '3.2.8 Instanciated config.json `podnet_a_enabled` and `podnet_b_enabled` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    podnet_a_enabled = instanciated_metadata['config.json'].get('podnet_a_enabled', True)
-    podnet_b_enabled = instanciated_metadata['config.json'].get('podnet_b_enabled', True)
+    podnet_a_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_a_enabled', default=True)
+    podnet_b_enabled = get_session_value('instanciated_metadata', 'config.json', 'podnet_b_enabled', default=True)
 
     if podnet_a_enabled is True and podnet_b_enabled is True:
         if test_map_bit & fail:                                     # Test fail
@@ -1026,29 +841,22 @@ def inst_conf_aben(test_id):
     else:                                                           # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.9 Validation of `ipv4_link_subnet` for a Valid network Range, from Instantiated Metadata config.json
-def inst_conf_4lvr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(29, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.9 Instanciated config.json `ipv4_link_subnet` network range - Ignore')
+def inst_conf_4lvr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.9 Instanciated config.json `ipv4_link_subnet` network range - Pass - is valid'
     warn_message   = '3.2.9 Instanciated config.json `ipv4_link_subnet` network range - Warn - is not valid'
     fail_message   = '3.2.9 Instanciated config.json `ipv4_link_subnet` network range - Fail - is not valid'
-    ignore_message = '3.2.9 Instanciated config.json `ipv4_link_subnet` network range - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_subnet = instanciated_metadata['config.json'].get('ipv4_link_subnet', '')
+    ipv4_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_subnet', default='')
 
     try:
         ipaddress.ip_network(ipv4_link_subnet)
@@ -1066,29 +874,22 @@ def inst_conf_4lvr(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.10 Validation of `ipv4_link_subnet` range mask, from Instantiated Metadata config.json
-def inst_conf_4lvm(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(30, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.10 Instanciated config.json `ipv4_link_subnet` range mask - Ignore')
+def inst_conf_4lvm(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.10 Instanciated config.json `ipv4_link_subnet` range mask - Pass - is >= /29'
     warn_message   = '3.2.10 Instanciated config.json `ipv4_link_subnet` range mask - Warn - is not >= /29'
     fail_message   = '3.2.10 Instanciated config.json `ipv4_link_subnet` range mask - Fail - is not >= /29'
-    ignore_message = '3.2.10 Instanciated config.json `ipv4_link_subnet` range mask - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_subnet = instanciated_metadata['config.json'].get('ipv4_link_subnet', '')
+    ipv4_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_subnet', default='')
     try:
         ipaddress.ip_network(ipv4_link_subnet)
         valid_subnet = True
@@ -1107,29 +908,22 @@ def inst_conf_4lvm(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.11 Validation of `ipv4_link_cpe` for a Valid IPAddress, from Instantiated Metadata config.json
-def inst_conf_4cva(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(31, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.11 Instanciated config.json `ipv4_link_cpe` IPAddress - Ignore')
+def inst_conf_4cva(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.11 Instanciated config.json `ipv4_link_cpe` IPAddress - Pass - is valid'
     warn_message   = '3.2.11 Instanciated config.json `ipv4_link_cpe` IPAddress - Warn - is not valid'
     fail_message   = '3.2.11 Instanciated config.json `ipv4_link_cpe` IPAddress - Fail - is not valid'
-    ignore_message = '3.2.11 Instanciated config.json `ipv4_link_cpe` IPAddress - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_cpe = instanciated_metadata['config.json'].get('ipv4_link_cpe', '')
+    ipv4_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_cpe', default='')
 
     try:
         ipaddress.ip_address(ipv4_link_cpe)
@@ -1147,30 +941,23 @@ def inst_conf_4cva(test_id):
         elif test_map_bit & warn:                      # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.12 Validation of `ipv4_link_cpe` from Instantiated Metadata config.json
-def inst_conf_4cpe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(32, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.12 Instanciated config.json `ipv4_link_cpe` - Ignore')
+def inst_conf_4cpe(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.12 Instanciated config.json `ipv4_link_cpe` - Pass - is in `ipv4_link_subnet`'
     warn_message   = '3.2.12 Instanciated config.json `ipv4_link_cpe` - Warn - is not in `ipv4_link_subnet`'
     fail_message   = '3.2.12 Instanciated config.json `ipv4_link_cpe` - Fail - is not in `ipv4_link_subnet`'
-    ignore_message = '3.2.12 Instanciated config.json `ipv4_link_cpe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_subnet = instanciated_metadata['config.json'].get('ipv4_link_subnet', '')
-    ipv4_link_cpe = instanciated_metadata['config.json'].get('ipv4_link_cpe', '')
+    ipv4_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_subnet', default='')
+    ipv4_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_cpe', default='')
 
     try:
         network = ipaddress.ip_network(ipv4_link_subnet)
@@ -1192,30 +979,23 @@ def inst_conf_4cpe(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.13 Validation of `ipv4_link_pe` for a Valid IPAddress, from Instantiated Metadata config.json
-def inst_conf_4pva(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(33, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.13 Instanciated config.json `ipv4_link_pe` IPAddress - Ignore')
+def inst_conf_4pva(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.13 Instanciated config.json `ipv4_link_pe` IPAddress - Pass - is valid'
     warn_message   = '3.2.13 Instanciated config.json `ipv4_link_pe` IPAddress - Warn - is not valid'
     fail_message   = '3.2.13 Instanciated config.json `ipv4_link_pe` IPAddress - Fail - is not valid'
-    ignore_message = '3.2.13 Instanciated config.json `ipv4_link_pe` IPAddress - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_subnet = instanciated_metadata['config.json'].get('ipv4_link_subnet', '')
-    ipv4_link_pe = instanciated_metadata['config.json'].get('ipv4_link_pe', '')
+    ipv4_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_subnet', default='')
+    ipv4_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_pe', default='')
 
     try:
         network = ipaddress.ip_network(ipv4_link_subnet)
@@ -1237,30 +1017,23 @@ def inst_conf_4pva(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.14 Validation of `ipv4_link_pe` from Instantiated Metadata config.json
-def inst_conf__4pe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(34, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.14 Instanciated config.json `ipv4_link_pe` - Ignore')
+def inst_conf__4pe(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.14 Instanciated config.json `ipv4_link_pe` - Pass - is in `ipv4_link_subnet`'
     warn_message   = '3.2.14 Instanciated config.json `ipv4_link_pe` - Warn - is not in `ipv4_link_subnet`'
     fail_message   = '3.2.14 Instanciated config.json `ipv4_link_pe` - Fail - is not in `ipv4_link_subnet`'
-    ignore_message = '3.2.14 Instanciated config.json `ipv4_link_pe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_subnet = instanciated_metadata['config.json'].get('ipv4_link_subnet', '')
-    ipv4_link_pe = instanciated_metadata['config.json'].get('ipv4_link_pe', '')
+    ipv4_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_subnet', default='')
+    ipv4_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_pe', default='')
 
     try:
         network = ipaddress.ip_network(ipv4_link_subnet)
@@ -1282,30 +1055,23 @@ def inst_conf__4pe(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.15 Validation of `ipv4_link_pe` != `ipv4_link_cpe` from Instantiated Metadata config.json
-def inst_conf_4pvc(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(35, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.15 Instanciated config.json `ipv4_link_pe` and `ipv4_link_cpe` - Ignore')
+def inst_conf_4pvc(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.15 Instanciated config.json `ipv4_link_pe` and `ipv4_link_cpe` - Pass - are not same'
     warn_message   = '3.2.15 Instanciated config.json `ipv4_link_pe` and `ipv4_link_cpe` - Warn - are same'
     fail_message   = '3.2.15 Instanciated config.json `ipv4_link_pe` and `ipv4_link_cpe` - Fail - are same'
-    ignore_message = '3.2.15 Instanciated config.json `ipv4_link_pe` and `ipv4_link_cpe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_pe = instanciated_metadata['config.json'].get('ipv4_link_pe', '')
-    ipv4_link_cpe = instanciated_metadata['config.json'].get('ipv4_link_cpe', '')
+    ipv4_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_pe', default='')
+    ipv4_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_cpe', default='')
 
     try:
         pe = ipaddress.ip_address(ipv4_link_pe)
@@ -1327,29 +1093,22 @@ def inst_conf_4pvc(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.16 Validation of `ipv6_link_subnet` for a Valid network Range, from Instantiated Metadata config.json
-def inst_conf_6lvr(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(36, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.16 Instanciated config.json `ipv6_link_subnet` network range - Ignore')
+def inst_conf_6lvr(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.16 Instanciated config.json `ipv6_link_subnet` network range - Pass - is valid'
     warn_message   = '3.2.16 Instanciated config.json `ipv6_link_subnet` network range - Warn - is not valid'
     fail_message   = '3.2.16 Instanciated config.json `ipv6_link_subnet` network range - Fail - is not valid'
-    ignore_message = '3.2.16 Instanciated config.json `ipv6_link_subnet` network range - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_subnet = instanciated_metadata['config.json'].get('ipv6_link_subnet', '')
+    ipv6_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_subnet', default='')
 
     try:
         ipaddress.ip_network(ipv6_link_subnet)
@@ -1367,29 +1126,22 @@ def inst_conf_6lvr(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.17 Validation of `ipv4_link_subnet` range mask, from Instantiated Metadata config.json
-def inst_conf_6lvm(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(37, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.17 Instanciated config.json `ipv6_link_subnet` range mask - Ignore')
+def inst_conf_6lvm(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.17 Instanciated config.json `ipv6_link_subnet` range mask - Pass - is >= /126'
     warn_message   = '3.2.17 Instanciated config.json `ipv6_link_subnet` range mask - Warn - is not >= /126'
     fail_message   = '3.2.17 Instanciated config.json `ipv6_link_subnet` range mask - Fail - is not >= /126'
-    ignore_message = '3.2.17 Instanciated config.json `ipv6_link_subnet` range mask - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_subnet = instanciated_metadata['config.json'].get('ipv6_link_subnet', '')
+    ipv6_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_subnet', default='')
     try:
         ipaddress.ip_network(ipv6_link_subnet)
         valid_subnet = True
@@ -1408,29 +1160,22 @@ def inst_conf_6lvm(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.18 Validation of `ipv8_link_cpe` for a Valid IPAddress, from Instantiated Metadata config.json
-def inst_conf_6cva(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(38, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.18 Instanciated config.json `ipv6_link_cpe` IPAddress - Ignore')
+def inst_conf_6cva(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.18 Instanciated config.json `ipv6_link_cpe` IPAddress - Pass - is valid'
     warn_message   = '3.2.18 Instanciated config.json `ipv6_link_cpe` IPAddress - Warn - is not valid'
     fail_message   = '3.2.18 Instanciated config.json `ipv6_link_cpe` IPAddress - Fail - is not valid'
-    ignore_message = '3.2.18 Instanciated config.json `ipv6_link_cpe` IPAddress - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_cpe = instanciated_metadata['config.json'].get('ipv6_link_cpe', '')
+    ipv6_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_cpe', default='')
 
     try:
         ipaddress.ip_address(ipv6_link_cpe)
@@ -1448,30 +1193,23 @@ def inst_conf_6cva(test_id):
         elif test_map_bit & warn:                      # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.19 Validation of `ipv6_link_cpe` from Instantiated Metadata config.json
-def inst_conf_6cpe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(39, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.19 Instanciated config.json `ipv6_link_cpe` - Ignore')
+def inst_conf_6cpe(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.19 Instanciated config.json `ipv6_link_cpe` - Pass - is in `ipv6_link_subnet`'
     warn_message   = '3.2.19 Instanciated config.json `ipv6_link_cpe` - Warn - is not in `ipv6_link_subnet`'
     fail_message   = '3.2.19 Instanciated config.json `ipv6_link_cpe` - Fail - is not in `ipv6_link_subnet`'
-    ignore_message = '3.2.19 Instanciated config.json `ipv6_link_cpe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_subnet = instanciated_metadata['config.json'].get('ipv6_link_subnet', '')
-    ipv6_link_cpe = instanciated_metadata['config.json'].get('ipv6_link_cpe', '')
+    ipv6_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_subnet', default='')
+    ipv6_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_cpe', default='')
 
     try:
         network = ipaddress.ip_network(ipv6_link_subnet)
@@ -1493,30 +1231,23 @@ def inst_conf_6cpe(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.20 Validation of `ipv6_link_pe` for a Valid IPAddress, from Instantiated Metadata config.json
-def inst_conf_6pva(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(40, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.20 Instanciated config.json `ipv6_link_pe` IPAddress - Ignore')
+def inst_conf_6pva(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.20 Instanciated config.json `ipv6_link_pe` IPAddress - Pass - is valid'
     warn_message   = '3.2.20 Instanciated config.json `ipv6_link_pe` IPAddress - Warn - is not valid'
     fail_message   = '3.2.20 Instanciated config.json `ipv6_link_pe` IPAddress - Fail - is not valid'
-    ignore_message = '3.2.20 Instanciated config.json `ipv6_link_pe` IPAddress - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_subnet = instanciated_metadata['config.json'].get('ipv6_link_subnet', '')
-    ipv6_link_pe = instanciated_metadata['config.json'].get('ipv6_link_pe', '')
+    ipv6_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_subnet', default='')
+    ipv6_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_pe', default='')
 
     try:
         network = ipaddress.ip_network(ipv6_link_subnet)
@@ -1538,30 +1269,23 @@ def inst_conf_6pva(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.21 Validation of `ipv6_link_pe` from Instantiated Metadata config.json
-def inst_conf__6pe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(41, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.21 Instanciated config.json `ipv6_link_pe` - Ignore')
+def inst_conf__6pe(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.21 Instanciated config.json `ipv6_link_pe` - Pass - is in `ipv6_link_subnet`'
     warn_message   = '3.2.21 Instanciated config.json `ipv6_link_pe` - Warn - is not in `ipv6_link_subnet`'
     fail_message   = '3.2.21 Instanciated config.json `ipv6_link_pe` - Fail - is not in `ipv6_link_subnet`'
-    ignore_message = '3.2.21 Instanciated config.json `ipv6_link_pe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_subnet = instanciated_metadata['config.json'].get('ipv6_link_subnet', '')
-    ipv6_link_pe = instanciated_metadata['config.json'].get('ipv6_link_pe', '')
+    ipv6_link_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_subnet', default='')
+    ipv6_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_pe', default='')
 
     try:
         network = ipaddress.ip_network(ipv6_link_subnet)
@@ -1583,30 +1307,23 @@ def inst_conf__6pe(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.22 Validation of `ipv6_link_pe` != `ipv6_link_cpe` from Instantiated Metadata config.json
-def inst_conf_6pvc(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(42, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.22 Instanciated config.json `ipv6_link_pe` and `ipv6_link_cpe` - Ignore')
+def inst_conf_6pvc(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.22 Instanciated config.json `ipv6_link_pe` and `ipv6_link_cpe` - Pass - are not same'
     warn_message   = '3.2.22 Instanciated config.json `ipv6_link_pe` and `ipv6_link_cpe` - Warn - are same'
     fail_message   = '3.2.22 Instanciated config.json `ipv6_link_pe` and `ipv6_link_cpe` - Fail - are same'
-    ignore_message = '3.2.22 Instanciated config.json `ipv6_link_pe` and `ipv6_link_cpe` - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_pe = instanciated_metadata['config.json'].get('ipv6_link_pe', '')
-    ipv6_link_cpe = instanciated_metadata['config.json'].get('ipv6_link_cpe', '')
+    ipv6_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_pe', default='')
+    ipv6_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_cpe', default='')
 
     try:
         pe = ipaddress.ip_address(ipv6_link_pe)
@@ -1628,29 +1345,22 @@ def inst_conf_6pvc(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.23 Validation of `primary_ipv4_subnet` for a Valid network Range, from Instantiated Metadata config.json
-def inst_conf_4pmv(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(43, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.23 Instanciated config.json `primary_ipv4_subnet` network range - Ignore')
+def inst_conf_4pmv(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.23 Instanciated config.json `primary_ipv4_subnet` network range - Pass - is valid'
     warn_message   = '3.2.23 Instanciated config.json `primary_ipv4_subnet` network range - Warn - is not valid'
     fail_message   = '3.2.23 Instanciated config.json `primary_ipv4_subnet` network range - Fail - is not valid'
-    ignore_message = '3.2.23 Instanciated config.json `primary_ipv4_subnet` network range - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    primary_ipv4_subnet = instanciated_metadata['config.json'].get('primary_ipv4_subnet', '')
+    primary_ipv4_subnet = get_session_value('instanciated_metadata', 'config.json', 'primary_ipv4_subnet', default='')
 
     try:
         ipaddress.ip_network(primary_ipv4_subnet)
@@ -1668,29 +1378,22 @@ def inst_conf_4pmv(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.24 Validation of `primary_ipv4_subnet` range mask, from Instantiated Metadata config.json
-def inst_conf_4pmm(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(44, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.24 Instanciated config.json `primary_ipv4_subnet` range mask - Ignore')
+def inst_conf_4pmm(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.24 Instanciated config.json `primary_ipv4_subnet` range mask - Pass - is >= /29'
     warn_message   = '3.2.24 Instanciated config.json `primary_ipv4_subnet` range mask - Warn - is not >= /29'
     fail_message   = '3.2.24 Instanciated config.json `primary_ipv4_subnet` range mask - Fail - is not >= /29'
-    ignore_message = '3.2.24 Instanciated config.json `primary_ipv4_subnet` range mask - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    primary_ipv4_subnet = instanciated_metadata['config.json'].get('primary_ipv4_subnet', '')
+    primary_ipv4_subnet = get_session_value('instanciated_metadata', 'config.json', 'primary_ipv4_subnet', default='')
     try:
         ipaddress.ip_network(primary_ipv4_subnet)
         valid_subnet = True
@@ -1709,29 +1412,22 @@ def inst_conf_4pmm(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.25 Validation of `ipv6_subnet` for a Valid network Range, from Instantiated Metadata config.json
-def inst_conf_6pmv(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(45, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.25 Instanciated config.json `ipv6_subnet` network range - Ignore')
+def inst_conf_6pmv(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.25 Instanciated config.json `ipv6_subnet` network range - Pass - is valid'
     warn_message   = '3.2.25 Instanciated config.json `ipv6_subnet` network range - Warn - is not valid'
     fail_message   = '3.2.25 Instanciated config.json `ipv6_subnet` network range - Fail - is not valid'
-    ignore_message = '3.2.25 Instanciated config.json `ipv6_subnet` network range - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:                                       # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_subnet = instanciated_metadata['config.json'].get('ipv6_subnet', '')
+    ipv6_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_subnet', default='')
 
     try:
         ipaddress.ip_network(ipv6_subnet)
@@ -1749,29 +1445,22 @@ def inst_conf_6pmv(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.26 Validation of `ipv6_subnet` range mask, from Instantiated Metadata config.json
-def inst_conf_6pmm(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(46, 'config', inputs=('instanciated_metadata',), ignore_message='3.2.26 Instanciated config.json `ipv6_subnet` range mask - Ignore')
+def inst_conf_6pmm(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.26 Instanciated config.json `ipv6_subnet` range mask - Pass - is >= /48'
     warn_message   = '3.2.26 Instanciated config.json `ipv6_subnet` range mask - Warn - is not >= /48'
     fail_message   = '3.2.26 Instanciated config.json `ipv6_subnet` range mask - Fail - is not >= /48'
-    ignore_message = '3.2.26 Instanciated config.json `ipv6_subnet` range mask - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_subnet = instanciated_metadata['config.json'].get('ipv6_subnet', '')
+    ipv6_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_subnet', default='')
     try:
         ipaddress.ip_network(ipv6_subnet)
         valid_subnet = True
@@ -1790,13 +1479,13 @@ def inst_conf_6pmm(test_id):
         elif test_map_bit & warn:                                  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.27 Validation of `dns_ips` from Instantiated Metadata config.json
-def inst_conf_dnss(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+def inst_conf_dnss(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.27 Instanciated config.json `dns_ips` - Pass - all are valid IPs'
     warn_message   = '3.2.27 Instanciated config.json `dns_ips` - Warn - all are not valid IPs'
@@ -1808,11 +1497,10 @@ def inst_conf_dnss(test_id):
     if test_map_bit & ignore:  # Test Ignore
         ignore_map += test_map_bit
         result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+        details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
         return
 
-    instanciated_metadata = get_instanciated_metadata()
-    dns_ips = instanciated_metadata['config.json'].get('dns_ips', 'add').split(',')
+    dns_ips = get_session_value('instanciated_metadata', 'config.json', 'dns_ips', default='add').split(',')
     valid_ips = True
     for dns_ip in dns_ips:
         try:
@@ -1830,13 +1518,13 @@ def inst_conf_dnss(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 3.2.28 Validation of `ceph_monitors` from Instantiated Metadata config.json
-def inst_conf_cmon(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+def inst_conf_cmon(details, test_id):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '3.2.28 Instanciated config.json `ceph_monitors` - Pass - is list and all are valid IPs'
     warn_message   = '3.2.28 Instanciated config.json `ceph_monitors` - Warn - Invalid'
@@ -1848,12 +1536,11 @@ def inst_conf_cmon(test_id):
     if test_map_bit & ignore:                                      # Test Ignore
         ignore_map += test_map_bit
         result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+        details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
         return
 
-    instanciated_metadata = get_instanciated_metadata()
-    ceph_monitors = instanciated_metadata['config.json'].get('ceph_monitors', [])
-    ipv6_subnet = instanciated_metadata['config.json'].get('ipv6_subnet', '::/127')
+    ceph_monitors = get_session_value('instanciated_metadata', 'config.json', 'ceph_monitors', default=[])
+    ipv6_subnet = get_session_value('instanciated_metadata', 'config.json', 'ipv6_subnet', default='::/127')
     valid = True
     for cmon in ceph_monitors:
         try:
@@ -1874,14 +1561,33 @@ def inst_conf_cmon(test_id):
         elif test_map_bit & warn:                                 # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
-def is_host_reachable_verbose(host, count=4):
+# Seconds to wait for a single ping reply, short enough that all of the pings of a test fit in PING_DEADLINE so a
+# test still tolerates up to three lost replies
+PING_TIMEOUT = 1
+# Seconds the whole ping block may take, the ping tests run concurrently so this bounds the block not each test
+PING_DEADLINE = 4
+
+
+def is_host_reachable_verbose(host, count=4, timeout=PING_TIMEOUT, deadline=None):
+    """
+    :param host: IP address or hostname to ping
+    :param count: The maximum number of pings to send
+    :param timeout: Seconds to wait for each reply
+    :param deadline: time.monotonic() value after which no more pings are sent, None for no deadline
+    :return: True if any ping was answered
+    """
     success = False
     for i in range(count):
-        response = ping(host)
+        probe_timeout = timeout
+        if deadline is not None:
+            probe_timeout = min(timeout, deadline - time.monotonic())
+            if probe_timeout <= 0:
+                break
+        response = ping(host, timeout=probe_timeout)
         if response is not None:
             success = True
             break
@@ -1891,26 +1597,19 @@ def is_host_reachable_verbose(host, count=4):
 # 6 Ping Tests
 # 6.1 IPv4 addresses
 # 6.1.1 Ping PE
-def ping_ipv4___pe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(47, 'ping', inputs=('instanciated_metadata',), timeout=PING_DEADLINE, ignore_message='6.1.1 Ping Test IPv4 PE - Ignore')
+def ping_ipv4___pe(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.1.1 Ping Test IPv4 PE - Pass - Success'
     warn_message   = '6.1.1 Ping Test IPv4 PE - Warn - Failed'
     fail_message   = '6.1.1 Ping Test IPv4 PE - Fail - Failed'
-    ignore_message = '6.1.1 Ping Test IPv4 PE - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_pe = instanciated_metadata['config.json'].get('ipv4_link_pe', '127.0.0.127')
+    ipv4_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_pe', default='127.0.0.127')
 
-    if is_host_reachable_verbose(ipv4_link_pe):  # Test pass
+    if is_host_reachable_verbose(ipv4_link_pe, deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -1920,31 +1619,24 @@ def ping_ipv4___pe(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.1.2 Ping CPE
-def ping_ipv4__cpe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(48, 'ping', inputs=('instanciated_metadata',), timeout=PING_DEADLINE, ignore_message='6.1.2 Ping Test IPv4 CPE - Ignore')
+def ping_ipv4__cpe(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.1.2 Ping Test IPv4 CPE - Pass - Success'
     warn_message   = '6.1.2 Ping Test IPv4 CPE - Warn - Failed'
     fail_message   = '6.1.2 Ping Test IPv4 CPE - Fail - Failed'
-    ignore_message = '6.1.2 Ping Test IPv4 CPE - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
+    ipv4_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv4_link_cpe', default='127.0.0.127')
 
-    instanciated_metadata = get_instanciated_metadata()
-    ipv4_link_cpe = instanciated_metadata['config.json'].get('ipv4_link_cpe', '127.0.0.127')
-
-    if is_host_reachable_verbose(ipv4_link_cpe):  # Test pass
+    if is_host_reachable_verbose(ipv4_link_cpe, deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -1954,28 +1646,22 @@ def ping_ipv4__cpe(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.1.3 Ping 8.8.8.8
-def ping_ipv4_8888(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(49, 'ping', timeout=PING_DEADLINE, ignore_message='6.1.3 Ping Test IPv4 8.8.8.8 - Ignore')
+def ping_ipv4_8888(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.1.3 Ping Test IPv4 8.8.8.8 - Pass - Success'
     warn_message   = '6.1.3 Ping Test IPv4 8.8.8.8 - Warn - Failed'
     fail_message   = '6.1.3 Ping Test IPv4 8.8.8.8 - Fail - Failed'
-    ignore_message = '6.1.3 Ping Test IPv4 8.8.8.8 - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    if is_host_reachable_verbose('8.8.8.8'):  # Test pass
+    if is_host_reachable_verbose('8.8.8.8', deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -1985,32 +1671,25 @@ def ping_ipv4_8888(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.2 IPv6 addresses
 # 6.2.1 Ping PE
-def ping_ipv6___pe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(50, 'ping', inputs=('instanciated_metadata',), timeout=PING_DEADLINE, ignore_message='6.2.1 Ping Test IPv6 PE - Ignore')
+def ping_ipv6___pe(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.2.1 Ping Test IPv6 PE - Pass - Success'
     warn_message   = '6.2.1 Ping Test IPv6 PE - Warn - Failed'
     fail_message   = '6.2.1 Ping Test IPv6 PE - Fail - Failed'
-    ignore_message = '6.2.1 Ping Test IPv6 PE - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_pe = instanciated_metadata['config.json'].get('ipv6_link_pe', '::127')
+    ipv6_link_pe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_pe', default='::127')
 
-    if is_host_reachable_verbose(ipv6_link_pe):  # Test pass
+    if is_host_reachable_verbose(ipv6_link_pe, deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -2020,31 +1699,24 @@ def ping_ipv6___pe(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.2.2 Ping CPE
-def ping_ipv6__cpe(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(51, 'ping', inputs=('instanciated_metadata',), timeout=PING_DEADLINE, ignore_message='6.2.2 Ping Test IPv6 CPE - Ignore')
+def ping_ipv6__cpe(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.2.2 Ping Test IPv6 CPE - Pass - Success'
     warn_message   = '6.2.2 Ping Test IPv6 CPE - Warn - Failed'
     fail_message   = '6.2.2 Ping Test IPv6 CPE - Fail - Failed'
-    ignore_message = '6.2.2 Ping Test IPv6 CPE - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
+    ipv6_link_cpe = get_session_value('instanciated_metadata', 'config.json', 'ipv6_link_cpe', default='::127')
 
-    instanciated_metadata = get_instanciated_metadata()
-    ipv6_link_cpe = instanciated_metadata['config.json'].get('ipv6_link_cpe', '::127')
-
-    if is_host_reachable_verbose(ipv6_link_cpe):  # Test pass
+    if is_host_reachable_verbose(ipv6_link_cpe, deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -2054,28 +1726,22 @@ def ping_ipv6__cpe(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.2.3 Ping 2001:4860:4860::8888
-def ping_ipv6_8888(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(52, 'ping', timeout=PING_DEADLINE, ignore_message='6.2.3 Ping Test IPv4 2001:4860:4860::8888 - Ignore')
+def ping_ipv6_8888(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.2.3 Ping Test IPv4 2001:4860:4860::8888 - Pass - Success'
     warn_message   = '6.2.3 Ping Test IPv4 2001:4860:4860::8888 - Warn - Failed'
     fail_message   = '6.2.3 Ping Test IPv4 2001:4860:4860::8888 - Fail - Failed'
-    ignore_message = '6.2.3 Ping Test IPv4 2001:4860:4860::8888 - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    if is_host_reachable_verbose('2001:4860:4860::8888'):  # Test pass
+    if is_host_reachable_verbose('2001:4860:4860::8888', deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -2085,29 +1751,23 @@ def ping_ipv6_8888(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return
 
 
 # 6.3 DNS hostnames
 # 6.3.1 Ping www.google.com
-def ping_dns__ggle(test_id):
-    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = get_test_details()
+@register(53, 'ping', timeout=PING_DEADLINE, ignore_message='6.3.1 Ping Test www.google.com - Ignore')
+def ping_dns__ggle(details, test_id, deadline=None):
+    result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map = details.get()
 
     pass_message   = '6.3.1 Ping Test www.google.com - Pass - Success'
     warn_message   = '6.3.1 Ping Test www.google.com - Warn - Failed'
     fail_message   = '6.3.1 Ping Test www.google.com - Fail - Failed'
-    ignore_message = '6.3.1 Ping Test www.google.com - Ignore'
 
     test_map_bit = 2 ** test_id
 
-    if test_map_bit & ignore:  # Test Ignore
-        ignore_map += test_map_bit
-        result[test_id] = ignore_message
-        update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
-        return
-
-    if is_host_reachable_verbose('www.google.com'):  # Test pass
+    if is_host_reachable_verbose('www.google.com', deadline=deadline):  # Test pass
         pass_map += test_map_bit
         result[test_id] = f'{pass_message}'
     else:
@@ -2117,5 +1777,5 @@ def ping_dns__ggle(test_id):
         elif test_map_bit & warn:  # Test warn
             warn_map += test_map_bit
             result[test_id] = f'{warn_message}'
-    update_test_details(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
+    details.update(result, fail, ignore, warn, fail_map, warn_map, ignore_map, pass_map)
     return